@@ -6,6 +6,9 @@ import random
 import os
 import colorsys
 
+from asset_registry import ASSETS
+from lighting import USE_CONE_SPRITES, LightLayer, quantize_cone
+
 BASE_PATH = os.path.dirname(__file__)
 
 # Screen scaling
@@ -38,12 +41,6 @@ def get_current_combo() -> int:
     return 0
 
 
-def scale_image(image: pygame.Surface, factor: float) -> pygame.Surface:
-    width = int(image.get_width() * factor)
-    height = int(image.get_height() * factor)
-    return pygame.transform.scale(image, (width, height))
-
-
 class Spotlight:
     def __init__(self, x, color=None, cone_angle=20):
         self.x = x
@@ -88,15 +85,22 @@ class Spotlight:
             self.target_x = self.x + math.sin(self.swing_time) * self.swing_amount
             self.target_y = SCREEN_HEIGHT + 100
 
-    def draw(self, surface):
-        cone = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+    def draw(self, surface, current_time):
         dx = self.target_x - self.x
         dy = self.target_y - self.y
         dist = math.hypot(dx, dy)
         ang = math.atan2(dy, dx)
+        base_hue = (current_time * 0.0001 + self.x/SCREEN_WIDTH) % 1.0
+        if USE_CONE_SPRITES:
+            key, ang, dist, base_hue = quantize_cone(ang, dist, base_hue)
+            return light_layer.draw_cached_cone(surface, (self.x, int(self.alpha), *key),
+                                                lambda: self.cone_polygons(ang, dist, base_hue))
+        return light_layer.draw_cone(surface, self.cone_polygons(ang, dist, base_hue))
+
+    def cone_polygons(self, ang, dist, base_hue):
         width = 2 * dist * math.tan(math.radians(self.cone_angle / 2))
-        base_hue = (pygame.time.get_ticks() * 0.0001 + self.x/SCREEN_WIDTH) % 1.0
         layers = 8
+        polygons = []
         for i in range(layers):
             hue = (base_hue + i / layers) % 1.0
             r, g, b = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
@@ -110,24 +114,35 @@ class Spotlight:
             right_x = end_x + math.sin(ang) * width * scale_f / 2
             right_y = end_y - math.cos(ang) * width * scale_f / 2
             pts = [(self.x, self.y), (left_x, left_y), (right_x, right_y)]
-            pygame.draw.polygon(cone, color, pts)
-        surface.blit(cone, (0, 0))
+            polygons.append((color, pts))
+        return polygons
 
 # Resource init
 initialized = False
 spotlights = []
+light_layer = LightLayer()  # Shared by every spotlight cone
 darkened_bg = None
+combo_tint = None
 speaker_left1 = speaker_left2 = None
 speaker_right1 = speaker_right2 = None
+golden_speakers = {}
 left_speaker_pos = right_speaker_pos = (0, 0)
 use_first_image = True
 last_swap_time = 0
 swap_interval = 300
 
 
+def load_speaker(name):
+    """Load a speaker frame and remember its golden-tinted variant."""
+    path = os.path.join(BASE_PATH, name)
+    img = ASSETS.scaled_by(path, 0.2*scale)
+    golden_speakers[img] = ASSETS.image(path, img.get_size(), tint=(255, 215, 0))
+    return img
+
+
 def init_background(screen):
     global initialized, SCREEN_WIDTH, SCREEN_HEIGHT, spotlights
-    global darkened_bg, speaker_left1, speaker_left2, speaker_right1, speaker_right2
+    global darkened_bg, combo_tint, speaker_left1, speaker_left2, speaker_right1, speaker_right2
     global left_speaker_pos, right_speaker_pos
     SCREEN_WIDTH, SCREEN_HEIGHT = screen.get_size()
     initialized = True
@@ -136,10 +151,14 @@ def init_background(screen):
     dark_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
     dark_overlay.fill((0, 0, 0, 160))
     darkened_bg.blit(dark_overlay, (0, 0))
-    speaker_left1 = scale_image(pygame.image.load(os.path.join(BASE_PATH, "SpeakLeft1.png")).convert_alpha(), 0.2*scale)
-    speaker_left2 = scale_image(pygame.image.load(os.path.join(BASE_PATH, "SpeakLeft2.png")).convert_alpha(), 0.2*scale)
-    speaker_right1 = scale_image(pygame.image.load(os.path.join(BASE_PATH, "SpeakRight1.png")).convert_alpha(), 0.2*scale)
-    speaker_right2 = scale_image(pygame.image.load(os.path.join(BASE_PATH, "SpeakRight2.png")).convert_alpha(), 0.2*scale)
+    # Golden tint for high combos: a solid fill blended with surface alpha, built once per canvas
+    combo_tint = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    combo_tint.fill((255, 215, 0))
+    combo_tint.set_alpha(80)
+    speaker_left1 = load_speaker("SpeakLeft1.png")
+    speaker_left2 = load_speaker("SpeakLeft2.png")
+    speaker_right1 = load_speaker("SpeakRight1.png")
+    speaker_right2 = load_speaker("SpeakRight2.png")
     left_x = int(SCREEN_WIDTH*0.3 - speaker_left1.get_width()/2)
     right_x = int(SCREEN_WIDTH*0.7 - speaker_right1.get_width()/2)
     left_speaker_pos = (left_x, SCREEN_HEIGHT - speaker_left1.get_height()*2)
@@ -149,23 +168,25 @@ def init_background(screen):
         sp.set_movement_pattern(random.choice(["sweep", "zigzag", "circular"]))
 
 # Main draw with golden tint when combo >=10
-def draw_dynamic_background(screen):
+def draw_dynamic_background(screen, time_ms=None):
+    """Draw one frame; time_ms is the song clock in ms (defaults to pygame ticks)."""
     global initialized, use_first_image, last_swap_time
     if not initialized:
         init_background(screen)
-    current_time = pygame.time.get_ticks()
+    current_time = pygame.time.get_ticks() if time_ms is None else time_ms
+    if current_time < last_swap_time:
+        # Song clock restarted with a new level
+        last_swap_time = current_time
     if current_time - last_swap_time > swap_interval:
         use_first_image = not use_first_image
         last_swap_time = current_time
     screen.blit(darkened_bg, (0, 0))
     combo = get_current_combo()
     if combo >= 10:
-        tint = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        tint.fill((255, 215, 0, 80))
-        screen.blit(tint, (0, 0))
+        screen.blit(combo_tint, (0, 0))
     for sp in spotlights:
         sp.update()
-        sp.draw(screen)
+        sp.draw(screen, current_time)
     # draw speakers
     if use_first_image:
         left_img = speaker_left1
@@ -174,9 +195,7 @@ def draw_dynamic_background(screen):
         left_img = speaker_left2
         right_img = speaker_right2
     if combo >= 10:
-        left_img = left_img.copy()
-        left_img.fill((255, 215, 0), special_flags=pygame.BLEND_RGB_MULT)
-        right_img = right_img.copy()
-        right_img.fill((255, 215, 0), special_flags=pygame.BLEND_RGB_MULT)
+        left_img = golden_speakers[left_img]
+        right_img = golden_speakers[right_img]
     screen.blit(left_img, left_speaker_pos)
     screen.blit(right_img, right_speaker_pos)
\ No newline at end of file
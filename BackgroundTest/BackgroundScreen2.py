@@ -6,12 +6,16 @@ import random
 import os
 import json
 
+from asset_registry import ScaleLadder
+
 BASE_PATH = os.path.dirname(__file__)
 
 # Global variables
 initialized = False
 background_image = None
 speaker1 = speaker2 = None
+speaker1_ladder = speaker2_ladder = None  # Pulse sizes, built in init_background
+SPEAKER_PULSE_SCALE = 0.25
 speaker1_pos = speaker2_pos = (0, 0)
 speaker1_width = speaker2_width = 250
 speaker1_height = speaker2_height = 200
@@ -19,7 +23,7 @@ use_first_image = True
 last_animation_time = 0
 
 # Pulse timing
-beat_pulse_time = 0
+beat_pulse_time = -1000
 beat_pulse_amount = 0
 beat_pulse_duration = 150
 ambient_pulse = 0
@@ -27,9 +31,10 @@ ambient_pulse_direction = 0.02
 
 # Shake timing
 last_milestone = 0
-shake_start_time = 0
+shake_start_time = -1000
 shake_duration = 1000   # ms of shake
 shake_amplitude = 5     # pixels of shake
+last_frame_time = 0
 
 # Try import combo from main module
 try:
@@ -44,8 +49,9 @@ dust_particles = []
 MAX_DUST_PARTICLES = 800
 MAX_SPEAKER_PARTICLES = 400
 
-# Screen dimensions
+# Screen dimensions and the persistent back buffer shake is applied from
 screen_width = screen_height = 0
+back_buffer = None
 
 # Beatmap data
 beatmap_times = []
@@ -78,10 +84,10 @@ class AudioAnalyzer:
         self.current_volume = 0
         self.frame_count = 0
 
-    def analyze(self):
+    def analyze(self, current_time):
         self.frame_count += 1
         if self.frame_count % 3 == 0:
-            t = pygame.time.get_ticks() * 0.001
+            t = current_time * 0.001
             osc = sum(o["amp"] * math.sin(t * o["freq"] + o["phase"]) for o in self.oscillators)
             base = 0.35
             rnd = random.uniform(-0.07, 0.07)
@@ -123,8 +129,8 @@ class DustParticle:
         self.wobble_amount = random.uniform(0.1, 0.4)
         self.wobble_offset = random.uniform(0, math.pi * 2)
 
-    def update(self):
-        wobble = math.sin(pygame.time.get_ticks() * self.wobble_speed + self.wobble_offset) * self.wobble_amount
+    def update(self, current_time):
+        wobble = math.sin(current_time * self.wobble_speed + self.wobble_offset) * self.wobble_amount
         self.x += self.vx + wobble
         self.y += self.vy
         self.size -= 0.003
@@ -187,10 +193,12 @@ class SpeakerParticle:
 # Initialize background assets
 def init_background(screen):
     global initialized, background_image, speaker1, speaker2
-    global speaker1_pos, speaker2_pos, screen_width, screen_height
-    if initialized: return
+    global speaker1_pos, speaker2_pos, screen_width, screen_height, back_buffer
+    global speaker1_ladder, speaker2_ladder
+    if initialized and screen.get_size() == (screen_width, screen_height): return
     screen_width, screen_height = screen.get_size()
     initialized = True
+    back_buffer = pygame.Surface((screen_width, screen_height))
     load_beatmap()
     bg = pygame.image.load(os.path.join(BASE_PATH, "Bg2.png")).convert()
     background_image = pygame.transform.scale(bg, (screen_width, screen_height))
@@ -198,17 +206,17 @@ def init_background(screen):
     s2 = pygame.image.load(os.path.join(BASE_PATH, "Lvl2Speaker2.png")).convert_alpha()
     speaker1 = pygame.transform.scale(s1, (speaker1_width, speaker1_height))
     speaker2 = pygame.transform.scale(s2, (speaker2_width, speaker2_height))
+    speaker1_ladder = ScaleLadder(speaker1, 1.0, 1.0 + SPEAKER_PULSE_SCALE, ratio=1.01)
+    speaker2_ladder = ScaleLadder(speaker2, 1.0, 1.0 + SPEAKER_PULSE_SCALE, ratio=1.01)
     speaker1_pos = (screen_width//2 - speaker1_width//2, int(screen_height*0.5))
     speaker2_pos = speaker1_pos
 
 # Beatmap timing check
-def check_beatmap_timing():
+def check_beatmap_timing(current_time):
     global current_beat_index, last_music_position
     if not beatmap_times: return False
     try:
-        pos_ms = pygame.mixer.music.get_pos()
-        if pos_ms == -1: return False
-        sec = pos_ms/1000.0
+        sec = current_time/1000.0
         if sec < last_music_position - 1.0:
             current_beat_index = 0
         last_music_position = sec
@@ -220,15 +228,21 @@ def check_beatmap_timing():
     return False
 
 # Main draw with shake and pulse
-def draw_dynamic_background(screen):
+def draw_dynamic_background(screen, time_ms=None):
+    """Draw one frame; time_ms is the song clock in ms (defaults to pygame ticks)."""
     global use_first_image, beat_pulse_time, last_animation_time
     global beat_pulse_amount, ambient_pulse, ambient_pulse_direction
-    global last_milestone, shake_start_time
+    global last_milestone, shake_start_time, last_frame_time
 
-    if not initialized:
+    if not initialized or screen.get_size() != (screen_width, screen_height):
         init_background(screen)
 
-    current_time = pygame.time.get_ticks()
+    current_time = pygame.time.get_ticks() if time_ms is None else time_ms
+    if current_time < last_frame_time:
+        # Song clock restarted with a new level
+        last_animation_time = current_time
+        beat_pulse_time = shake_start_time = current_time - shake_duration
+    last_frame_time = current_time
     # combo-driven shake
     combo = get_current_combo()
     if combo > 0 and combo % 5 == 0 and combo != last_milestone:
@@ -240,10 +254,10 @@ def draw_dynamic_background(screen):
         dx = random.randint(-shake_amplitude, shake_amplitude)
         dy = random.randint(-shake_amplitude, shake_amplitude)
     # render to buffer
-    buf = pygame.Surface((screen_width, screen_height))
+    buf = back_buffer
     buf.blit(background_image, (0, 0))
     # beatmap/music triggers
-    if check_beatmap_timing():
+    if check_beatmap_timing(current_time):
         beat_pulse_time = current_time
         beat_pulse_amount = 0.8
         use_first_image = not use_first_image
@@ -253,7 +267,7 @@ def draw_dynamic_background(screen):
         for _ in range(min(MAX_SPEAKER_PARTICLES-len(speaker_particles), random.randint(18,28))):
             speaker_particles.append(SpeakerParticle(cx, cy, 0.9))
     # audio fallback
-    vol = audio_analyzer.analyze()
+    vol = audio_analyzer.analyze(current_time)
     if vol > 0.65 and not beatmap_times:
         beat_pulse_time = current_time
         beat_pulse_amount = vol
@@ -279,11 +293,9 @@ def draw_dynamic_background(screen):
             ambient_pulse, ambient_pulse_direction = 0, 0.02
         current_pulse = ambient_pulse
     # draw & scale speaker
-    speaker_img = speaker1 if use_first_image else speaker2
-    sf = 1.0 + current_pulse*0.25
-    w = int(speaker1_width*sf)
-    h = int(speaker1_height*sf)
-    scaled = pygame.transform.scale(speaker_img,(w,h))
+    ladder = speaker1_ladder if use_first_image else speaker2_ladder
+    scaled = ladder.get(1.0 + current_pulse*SPEAKER_PULSE_SCALE)
+    w, h = scaled.get_size()
     ox = speaker1_pos[0] - (w-speaker1_width)//2
     oy = speaker1_pos[1] - (h-speaker1_height)//2
     buf.blit(scaled,(ox,oy))
@@ -301,7 +313,7 @@ def draw_dynamic_background(screen):
             dust_particles.append(DustParticle(x,y))
     # draw dust
     for p in dust_particles[:]:
-        if not p.update(): dust_particles.remove(p)
+        if not p.update(current_time): dust_particles.remove(p)
         else: p.draw(buf)
     # draw speaker particles
     for p in speaker_particles[:]:
@@ -4,18 +4,25 @@ import random
 import os
 import colorsys
 
+from asset_registry import ScaleLadder
+from lighting import USE_CONE_SPRITES, LightLayer, quantize_cone
+
 BASE_PATH = os.path.dirname(__file__)
 
 # Globals
 initialized = False
 screen_width = screen_height = 0
+back_buffer = None  # Reused every frame; shake is the offset it's blitted at
 background_image = None
 left_speaker = right_speaker = None
 speaker_width, speaker_height = 180, 180
 left_speaker_pos = right_speaker_pos = (0, 0)
+left_speaker_ladder = right_speaker_ladder = None  # Pulse sizes, built in init_background
+SPEAKER_BASE_SCALE = 1.5
+SPEAKER_PULSE_SCALE = 0.3
 
 #pulse
-beat_pulse_time = 0
+beat_pulse_time = -1000
 beat_pulse_amount = 0
 beat_pulse_duration = 150
 ambient_pulse = 0
@@ -40,13 +47,18 @@ def get_current_combo() -> int:
     return 0
 
 # Screen shake on combo milestones
-shake_start_time = 0
+shake_start_time = -1000
 shake_duration = 1000  
 shake_amplitude = 5   
 last_shake_combo=0
+last_frame_time = 0
 
 # Smoke effect
 SMOKE_IMG = None
+smoke_ladder = None
+SMOKE_START_SCALE = 0.1
+SMOKE_GROWTH = 0.02
+SMOKE_MAX_SCALE = 3.85  # Puffs fade out after 187 updates, at a scale of 3.84
 smoke_left = smoke_right = None
 MAX_PARTICLES = 4
 BURST_COUNT = 2
@@ -54,11 +66,7 @@ last_smoke_combo=0
 
 # Spotlights
 spotlights = []
-
-def scale(img: pygame.Surface, factor: float) -> pygame.Surface:
-    w = int(img.get_width() * factor)
-    h = int(img.get_height() * factor)
-    return pygame.transform.scale(img, (w, h))
+light_layer = LightLayer()  # Shared by every spotlight cone
 
 class AudioAnalyzer:
     def __init__(self):
@@ -71,10 +79,10 @@ class AudioAnalyzer:
         self.current_volume = 0
         self.frame_count = 0
 
-    def analyze(self) -> float:
+    def analyze(self, current_time) -> float:
         self.frame_count += 1
         if self.frame_count % 3 == 0:
-            t = pygame.time.get_ticks() * 0.001
+            t = current_time * 0.001
             osc = sum(o["amp"] * math.sin(t * o["freq"] + o["phase"])
                       for o in self.oscillators)
             base = 0.35
@@ -88,8 +96,8 @@ audio_analyzer = AudioAnalyzer()
 class SmokeParticle:
     def __init__(self, x: float, y: float):
         self.x, self.y = x, y
-        self.scale_k = 0.1
-        self.img = scale(SMOKE_IMG, self.scale_k)
+        self.scale_k = SMOKE_START_SCALE
+        self.img = smoke_ladder.get(self.scale_k)
         self.alpha = 255
         self.alpha_rate = 3
         self.alive = True
@@ -99,16 +107,17 @@ class SmokeParticle:
     def update(self):
         self.x += self.vx
         self.y -= self.vy
-        self.scale_k += 0.02
+        self.scale_k += SMOKE_GROWTH
         self.alpha -= self.alpha_rate
         if self.alpha <= 0:
             self.alpha = 0
             self.alive = False
         self.alpha_rate = max(1.0, self.alpha_rate - 0.03)
-        self.img = scale(SMOKE_IMG, self.scale_k)
-        self.img.set_alpha(int(self.alpha))
+        self.img = smoke_ladder.get(self.scale_k)
 
     def draw(self, surface: pygame.Surface):
+        # Ladder steps are shared between puffs, so the alpha is set per blit
+        self.img.set_alpha(int(self.alpha))
         rect = self.img.get_rect(center=(int(self.x), int(self.y)))
         surface.blit(self.img, rect)
 
@@ -158,19 +167,28 @@ class Spotlight:
         self.target_x, self.target_y = tx, ty
 
     def draw(self, surface: pygame.Surface):
-        cone = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
         dx, dy = self.target_x - self.x, self.target_y - self.y
         dist = math.hypot(dx, dy)
         ang  = math.atan2(dy, dx)
+        if USE_CONE_SPRITES:
+            key, ang, dist, hue = quantize_cone(ang, dist, self.hue)
+            return light_layer.draw_cached_cone(surface, (self.x, *key),
+                                                lambda: self.cone_polygons(ang, dist, hue))
+        return light_layer.draw_cone(surface, self.cone_polygons(ang, dist, self.hue))
+
+    def cone_polygons(self, ang, dist, hue):
+        target_x = self.x + math.cos(ang) * dist
+        target_y = self.y + math.sin(ang) * dist
         width = 2 * dist * math.tan(math.radians(self.cone_angle / 2))
         p0 = (self.x, self.y)
-        p1 = (self.target_x - width/2*math.cos(ang+math.pi/2),self.target_y - width/2*math.sin(ang+math.pi/2))
-        p2 = (self.target_x + width/2*math.cos(ang+math.pi/2),self.target_y + width/2*math.sin(ang+math.pi/2))
+        p1 = (target_x - width/2*math.cos(ang+math.pi/2),target_y - width/2*math.sin(ang+math.pi/2))
+        p2 = (target_x + width/2*math.cos(ang+math.pi/2),target_y + width/2*math.sin(ang+math.pi/2))
+        polygons = []
         #rainbow stuff
         for i in range(5):
             alpha = int(self.alpha * 1.5 * (5 - i) / 5)
             alpha = min(alpha, 255)
-            hue_i = (self.hue + i*0.02) % 1.0
+            hue_i = (hue + i*0.02) % 1.0
             r, g, b = colorsys.hsv_to_rgb(hue_i, 1, 1)
             color = (int(r*255), int(g*255), int(b*255), alpha)
     
@@ -178,21 +196,22 @@ class Spotlight:
             v1 = (p0[0] + (p1[0]-p0[0])*sf, p0[1] + (p1[1]-p0[1])*sf)
             v2 = (p0[0] + (p2[0]-p0[0])*sf, p0[1] + (p2[1]-p0[1])*sf)
             
-            pygame.draw.polygon(cone, color, [p0, v1, v2])
-        
-        surface.blit(cone, (0,0))
+            polygons.append((color, [p0, v1, v2]))
+        return polygons
 
 def init_background(screen: pygame.Surface):
     global initialized, screen_width, screen_height
     global background_image, left_speaker, right_speaker
     global left_speaker_pos, right_speaker_pos
-    global SMOKE_IMG, smoke_left, smoke_right, spotlights
+    global SMOKE_IMG, smoke_left, smoke_right, spotlights, back_buffer
+    global smoke_ladder, left_speaker_ladder, right_speaker_ladder
 
-    if initialized:
+    if initialized and screen.get_size() == (screen_width, screen_height):
         return
 
     screen_width, screen_height = screen.get_size()
     initialized = True
+    back_buffer = pygame.Surface((screen_width, screen_height))
 
     # bg + speak+ smoke
     bg = pygame.image.load(os.path.join(BASE_PATH, "Bg3.png")).convert()
@@ -203,7 +222,12 @@ def init_background(screen: pygame.Surface):
     right_speaker = pygame.transform.scale(rs, (speaker_width, speaker_height))
     left_speaker_pos = (20, 20)
     right_speaker_pos = (screen_width - speaker_width - 20, 20)
+    high = SPEAKER_BASE_SCALE * (1.0 + SPEAKER_PULSE_SCALE)
+    left_speaker_ladder = ScaleLadder(left_speaker, SPEAKER_BASE_SCALE, high, ratio=1.01)
+    right_speaker_ladder = ScaleLadder(right_speaker, SPEAKER_BASE_SCALE, high, ratio=1.01)
     SMOKE_IMG = pygame.image.load(os.path.join(BASE_PATH, "smoke.png")).convert_alpha()
+    # Coarse 7% steps: the large late steps hold most of the memory, and puffs are nearly transparent by then
+    smoke_ladder = ScaleLadder(SMOKE_IMG, SMOKE_START_SCALE, SMOKE_MAX_SCALE, ratio=1.07)
     smoke_left = SmokeEmitter(200, screen_height - 60)
     smoke_right = SmokeEmitter(screen_width - 200, screen_height - 60)
 
@@ -215,15 +239,20 @@ def init_background(screen: pygame.Surface):
         Spotlight(screen_width * 0.8),
     ]
 
-def draw_dynamic_background(screen: pygame.Surface):
+def draw_dynamic_background(screen: pygame.Surface, time_ms=None):
+    """Draw one frame; time_ms is the song clock in ms (defaults to pygame ticks)."""
     global beat_pulse_time, beat_pulse_amount
     global ambient_pulse, ambient_pulse_direction
-    global last_shake_combo,last_smoke_combo, shake_start_time 
+    global last_shake_combo,last_smoke_combo, shake_start_time, last_frame_time
 
-    if not initialized:
+    if not initialized or screen.get_size() != (screen_width, screen_height):
         init_background(screen)
 
-    t_now = pygame.time.get_ticks()
+    t_now = pygame.time.get_ticks() if time_ms is None else time_ms
+    if t_now < last_frame_time:
+        # Song clock restarted with a new level
+        beat_pulse_time = shake_start_time = t_now - shake_duration
+    last_frame_time = t_now
     combo = get_current_combo()
 
 
@@ -243,7 +272,7 @@ def draw_dynamic_background(screen: pygame.Surface):
         dy = random.randint(-shake_amplitude, shake_amplitude)
 
     # start buffer
-    buf = pygame.Surface((screen_width, screen_height))
+    buf = back_buffer
     buf.blit(background_image, (0, 0))
 
     #moke
@@ -259,7 +288,7 @@ def draw_dynamic_background(screen: pygame.Surface):
             sp.draw(buf)
 
     
-    vol = audio_analyzer.analyze()
+    vol = audio_analyzer.analyze(t_now)
     if vol > 0.5:
         beat_pulse_time = t_now
         beat_pulse_amount = vol
@@ -275,11 +304,10 @@ def draw_dynamic_background(screen: pygame.Surface):
         current_pulse = ambient_pulse
 
     # Speak pulse
-    speaker_scale = 1.0 + current_pulse * 0.3
-    for img, pos in [(left_speaker, left_speaker_pos), (right_speaker, right_speaker_pos)]:
-        w = int(speaker_width * speaker_scale * 1.5)
-        h = int(speaker_height * speaker_scale * 1.5)
-        scaled = pygame.transform.scale(img, (w, h))
+    speaker_scale = SPEAKER_BASE_SCALE * (1.0 + current_pulse * SPEAKER_PULSE_SCALE)
+    for ladder, pos in [(left_speaker_ladder, left_speaker_pos), (right_speaker_ladder, right_speaker_pos)]:
+        scaled = ladder.get(speaker_scale)
+        w, h = scaled.get_size()
         adj_x = pos[0] - (w - speaker_width) // 2
         adj_y = pos[1] - (h - speaker_height) // 2
         buf.blit(scaled, (adj_x, adj_y))
@@ -8,9 +8,24 @@ import pygame.mixer
 import math
 from pathlib import Path
 
+import numpy as np
+
 from BackgroundTest.BackgroundScreen import draw_dynamic_background as draw_bg_1
 from BackgroundTest.BackgroundScreen2 import draw_dynamic_background as draw_bg_2
 from BackgroundTest.BackgroundScreen3 import draw_dynamic_background as draw_bg_3
+from song_clock import SongClock
+from chart import load_chart
+from song_cache import SONG_CACHE
+from asset_registry import ASSETS
+from text_cache import TEXT_CACHE
+from font_registry import FONTS, LazyFont
+from simulation import LEVELS, TARGET_Y, MAX_HEALTH, INITIAL_HEALTH, LevelSimulation
+from replay import Replay, ReplayPlayer
+from profiler import FrameProfiler
+from particles import ParticleSystem
+from renderer import DirtyRectRenderer, is_animated
+from render_target import RENDER_TARGET, render_size
+from compositor import Compositor, STATIC, ANIMATED, DYNAMIC
 
 pygame.init()
 
@@ -18,17 +33,15 @@ clock = pygame.time.Clock()
 
 
 # === Constants ===
-screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-SCREEN_WIDTH, SCREEN_HEIGHT = screen.get_size()
+# The internal canvas everything is drawn into; main() opens the window and scales it to the display.
+# Layout below is in canvas pixels, so it looks the same on every display.
+SCREEN_WIDTH, SCREEN_HEIGHT = render_size(pygame.display.get_desktop_sizes()[0])
 
 ARROW_SIZE = 80
 ARROW_SPACING = 100
-TARGET_Y = 100
 GLOW_DURATION = 15
 RATING_DISPLAY_TIME = 30
 
-MAX_HEALTH = 300
-INITIAL_HEALTH = 100
 SHAKE_INTENSITY = 3
 HEALTH_BAR_WIDTH = 300
 HEALTH_BAR_HEIGHT = 30
@@ -41,9 +54,11 @@ SAVE_FILE = "game_progress.json"
 
 max_score = 2000
 
-def draw_bg_0(screen):
+def draw_bg_0(screen, time_ms=None):
     screen.fill(GRAY)  
 
+draw_bg_0.animated = False  # Lets the dirty-rect renderer cache it
+
 
 # Set the working directory to the script's location
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
@@ -55,26 +70,72 @@ def resizeObject(originObject, scaledFactor):
     return pygame.transform.scale_by(originObject, scaledFactor)
 
 def load_font(path, size):
-    return pygame.font.Font(path, size)
+    return FONTS.get(path, size)
 
 # === Fonts ===
-atlantaFont = load_font("assets/Atlanta-College.ttf", 30)
-atlantaFontLarge = load_font("assets/Atlanta-College.ttf", 60)
-gladoliaFont = load_font("assets/Gladolia-Regular.otf", 30)
-gladoliaFontLarge = load_font("assets/Gladolia-Regular.otf", 60)
-moldieFont = load_font("assets/Moldie.otf", 30)
-moldieFontLarge = load_font("assets/Moldie.otf", 60)
-pixelGameFont = load_font("assets/PixelGame.otf", 30)
-pixelGameFontLarge = load_font("assets/PixelGame.otf", 60)
-pixelGameFontHuge = load_font("assets/PixelGame.otf", 85)
+# Faces are opened on first use rather than at import
+atlantaFont = LazyFont("assets/Atlanta-College.ttf", 30)
+atlantaFontLarge = LazyFont("assets/Atlanta-College.ttf", 60)
+gladoliaFont = LazyFont("assets/Gladolia-Regular.otf", 30)
+gladoliaFontLarge = LazyFont("assets/Gladolia-Regular.otf", 60)
+moldieFont = LazyFont("assets/Moldie.otf", 30)
+moldieFontLarge = LazyFont("assets/Moldie.otf", 60)
+pixelGameFont = LazyFont("assets/PixelGame.otf", 30)
+pixelGameFontLarge = LazyFont("assets/PixelGame.otf", 60)
+pixelGameFontHuge = LazyFont("assets/PixelGame.otf", 85)
+
+# === Audio ===
+MENU_MUSIC = 'BackgroundTest/SoulChef.mp3'
+MISSING_AUDIO = set()  # Paths that failed to load, for the benchmark report
+
+
+class SilentSound:
+    """Stands in for a sound effect that could not be loaded."""
+
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+
+def load_sound(path):
+    # A missing file (or no audio device) leaves the effect silent instead of stopping the game
+    try:
+        return pygame.mixer.Sound(path)
+    except (pygame.error, FileNotFoundError) as e:
+        print(f"Warning: Could not load {path}: {e}", file=sys.stderr)
+        MISSING_AUDIO.add(path)
+        return SilentSound()
+
+
+def load_music(path, volume):
+    """Load `path` into the music stream; returns False if it could not be loaded."""
+    try:
+        pygame.mixer.music.load(path)
+    except (pygame.error, FileNotFoundError) as e:
+        print(f"Warning: Could not load {path}: {e}", file=sys.stderr)
+        MISSING_AUDIO.add(path)
+        return False
+    pygame.mixer.music.set_volume(volume)
+    return True
+
+
+def play_menu_music():
+    if load_music(MENU_MUSIC, 0.5):
+        pygame.mixer.music.play(-1)
+
 
 #Sound effects tab
-option_effect = pygame.mixer.Sound("music\option_effect.wav")
-miss_note = pygame.mixer.Sound("music\hit_effect.wav")
-defeat_effect = pygame.mixer.Sound("music\defeat.wav")
-win_effect = pygame.mixer.Sound("music\level-win.mp3")
-intro_sound = pygame.mixer.Sound("music\intro.wav")
-credit_sound = pygame.mixer.Sound("music\credit.mp3")
+option_effect = load_sound("music/option_effect.wav")
+miss_note = load_sound("music/hit_effect.wav")
+defeat_effect = load_sound("music/defeat.wav")
+win_effect = load_sound("music/level-win.mp3")
+intro_sound = load_sound("music/intro.wav")
+credit_sound = load_sound("music/credit.mp3")
 
 class Character:
     def __init__(self, x, y, screen_width, screen_height,speed):
@@ -108,13 +169,11 @@ class Character:
         for i in range(1, frame_count + 1):
             try:
                 path = os.path.join(SPRITE_FOLDER, f"{base_name}({i}).png")
-                img = pygame.image.load(path).convert_alpha()
-                frames.append(pygame.transform.scale_by(img, self.scale))
+                frames.append(ASSETS.scaled_by(path, self.scale))
             except:
                 try:
                     path = os.path.join(SPRITE_FOLDER, f"{base_name}({i}).PNG")
-                    img = pygame.image.load(path).convert_alpha()
-                    frames.append(pygame.transform.scale_by(img, self.scale))
+                    frames.append(ASSETS.scaled_by(path, self.scale))
                 except:
                     # Create placeholder if image fails to load
                     placeholder = pygame.Surface((50, 50), pygame.SRCALPHA)
@@ -152,68 +211,7 @@ class Character:
 
 
     def draw(self, surface):
-        surface.blit(self.image, (self.x, self.y))
-
-# === Particle System ===
-class Particle:
-    def __init__(self, x, y, color, velocity_x=0, velocity_y=0, life=60, size=3):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity_x = velocity_x
-        self.velocity_y = velocity_y
-        self.life = life
-        self.max_life = life
-        self.size = size
-        self.gravity = 0.1
-
-    def update(self):
-        self.x += self.velocity_x
-        self.y += self.velocity_y
-        self.velocity_y += self.gravity
-        self.life -= 1
-        
-        # Fade out effect
-        alpha = int(255 * (self.life / self.max_life))
-        self.color = (*self.color[:3], max(0, alpha))
-
-    def draw(self, screen):
-        if self.life > 0:
-            # Create surface with per-pixel alpha
-            surf = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, self.color, (self.size, self.size), self.size)
-            screen.blit(surf, (self.x - self.size, self.y - self.size))
-
-class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-
-    def add_explosion(self, x, y, color, count=15):
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8)
-            vel_x = math.cos(angle) * speed
-            vel_y = math.sin(angle) * speed
-            life = random.randint(30, 60)
-            size = random.randint(2, 5)
-            self.particles.append(Particle(x, y, color, vel_x, vel_y, life, size))
-
-    def add_trail(self, x, y, color, count=5):
-        for _ in range(count):
-            vel_x = random.uniform(-1, 1)
-            vel_y = random.uniform(-3, -1)
-            life = random.randint(20, 40)
-            size = random.randint(1, 3)
-            self.particles.append(Particle(x, y, color, vel_x, vel_y, life, size))
-
-    def update(self):
-        self.particles = [p for p in self.particles if p.life > 0]
-        for particle in self.particles:
-            particle.update()
-
-    def draw(self, screen):
-        for particle in self.particles:
-            particle.draw(screen)
+        return surface.blit(self.image, (self.x, self.y))
 
 # === Enhanced Rain Effect ===
 class RainDrop:
@@ -241,6 +239,28 @@ class RainDrop:
         pygame.draw.line(screen, self.color, (self.x, self.y), (end_x, end_y), self.thickness)
 
 # === Background Effects ===
+# (pulse_intensity, size) -> full-screen gradient; pulse_intensity only takes about 20 values
+_gradient_cache = {}
+
+
+def gradient_surface(pulse_intensity, size):
+    """Vertical gradient for a pulse intensity, built once as a 1-pixel column and stretched."""
+    key = (pulse_intensity, size)
+    surface = _gradient_cache.get(key)
+    if surface is None:
+        base_color1 = (20 + pulse_intensity, 10 + pulse_intensity//2, 40 + pulse_intensity)
+        base_color2 = (10 + pulse_intensity//2, 20 + pulse_intensity, 60 + pulse_intensity)
+
+        width, height = size
+        ratio = (np.arange(height) / height)[:, None]
+        column = (np.array(base_color1) * (1 - ratio) + np.array(base_color2) * ratio).astype(np.uint8)
+        surface = pygame.transform.scale(pygame.surfarray.make_surface(column[None, :, :]), size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        _gradient_cache[key] = surface
+    return surface
+
+
 class BackgroundEffect:
     def __init__(self):
         self.time = 0
@@ -254,19 +274,53 @@ class BackgroundEffect:
             self.pulse_intensity -= 1
     
     def draw_gradient_background(self, screen):
-        # Create animated gradient background
-        base_color1 = (20 + self.pulse_intensity, 10 + self.pulse_intensity//2, 40 + self.pulse_intensity)
-        base_color2 = (10 + self.pulse_intensity//2, 20 + self.pulse_intensity, 60 + self.pulse_intensity)
-        
-        # Simple gradient effect
-        for y in range(SCREEN_HEIGHT):
-            ratio = y / SCREEN_HEIGHT
-            r = int(base_color1[0] * (1 - ratio) + base_color2[0] * ratio)
-            g = int(base_color1[1] * (1 - ratio) + base_color2[1] * ratio)
-            b = int(base_color1[2] * (1 - ratio) + base_color2[2] * ratio)
-            pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+        screen.blit(gradient_surface(self.pulse_intensity, (SCREEN_WIDTH, SCREEN_HEIGHT)), (0, 0))
 
 # === Enhanced Title Rendering ===
+TITLE_GLOW_RADIUS = 5
+TITLE_SHADOW_OFFSET = 3
+TITLE_SCALE_STEP = 0.05  # Scales are rounded to this step so scaled fragments can be cached
+
+_title_fragments = {}  # (font, text, color) -> (baked sprite, advance width)
+_scaled_title_fragments = {}  # (font, text, color, scale) -> scaled sprite
+
+
+def bake_title_fragment(font, text, color):
+    """Render one title fragment with its glow halo and drop shadow, once per font and colour."""
+    key = (font, text, color)
+    baked = _title_fragments.get(key)
+    if baked is None:
+        surf = font.render(text, True, color)
+        pad = TITLE_GLOW_RADIUS
+        sprite = pygame.Surface((surf.get_width() + 2 * pad, surf.get_height() + 2 * pad), pygame.SRCALPHA)
+
+        # Enhanced glow effect
+        for glow_size in range(TITLE_GLOW_RADIUS, 0, -1):
+            glow_color = (*color[:3], 50)
+            glow_surf = font.render(text, True, glow_color)
+            for dx in range(-glow_size, glow_size + 1):
+                for dy in range(-glow_size, glow_size + 1):
+                    if dx*dx + dy*dy <= glow_size*glow_size:
+                        sprite.blit(glow_surf, (pad + dx, pad + dy))
+
+        shadow = font.render(text, True, DARK_SHADOW)
+        sprite.blit(shadow, (pad + TITLE_SHADOW_OFFSET, pad + TITLE_SHADOW_OFFSET))
+        sprite.blit(surf, (pad, pad))
+        baked = _title_fragments[key] = (sprite, surf.get_width())
+    return baked
+
+
+def scaled_title_fragment(font, text, color, scale):
+    key = (font, text, color, scale)
+    sprite = _scaled_title_fragments.get(key)
+    if sprite is None:
+        sprite = bake_title_fragment(font, text, color)[0]
+        if scale != 1:
+            sprite = resizeObject(sprite, scale)
+        _scaled_title_fragments[key] = sprite
+    return sprite
+
+
 def render_neon_title_scaled(screen, font, screen_width, y_offset, scale, time_offset=0):
     title_texts = [
         ("F", NEON_RED),
@@ -277,44 +331,30 @@ def render_neon_title_scaled(screen, font, screen_width, y_offset, scale, time_o
         ("riday", WHITE),
     ]
 
-    total_width = sum(font.render(text, True, color).get_width() for text, color in title_texts)
-    height = font.get_height()
-    title_surface = pygame.Surface((total_width, height), pygame.SRCALPHA)
+    # Only the wave offsets and the final placement change per frame
+    scale = round(round(scale / TITLE_SCALE_STEP) * TITLE_SCALE_STEP, 2)
+    total_width = sum(bake_title_fragment(font, text, color)[1] for text, color in title_texts)
+    left = (screen_width - int(total_width * scale)) // 2
+    pad = TITLE_GLOW_RADIUS
 
     x_offset = 0
     for i, (text, color) in enumerate(title_texts):
         # Add subtle wave motion to letters
         wave_y = math.sin(time_offset + i * 0.5) * 2
-        
-        # Enhanced glow effect
-        for glow_size in range(5, 0, -1):
-            glow_color = (*color[:3], 50)
-            glow_surf = font.render(text, True, glow_color)
-            for dx in range(-glow_size, glow_size + 1):
-                for dy in range(-glow_size, glow_size + 1):
-                    if dx*dx + dy*dy <= glow_size*glow_size:
-                        title_surface.blit(glow_surf, (x_offset + dx, wave_y + dy))
-        
-        # Main text
-        surf = font.render(text, True, color)
-        shadow = font.render(text, True, DARK_SHADOW)
-        title_surface.blit(shadow, (x_offset + 3, wave_y + 3))
-        title_surface.blit(surf, (x_offset, wave_y))
-        x_offset += surf.get_width()
-
-    scaled_title = resizeObject(title_surface, scale)
-    screen.blit(scaled_title, ((screen_width - scaled_title.get_width()) // 2, y_offset))
+        sprite = scaled_title_fragment(font, text, color, scale)
+        screen.blit(sprite, (left + int((x_offset - pad) * scale), y_offset + int((wave_y - pad) * scale)))
+        x_offset += bake_title_fragment(font, text, color)[1]
 
 # === Intro Screen ===
+PROMPT_FADE_STEPS = 16
+
 def show_intro_screen(screen):
-    pygame.mixer.music.load('BackgroundTest/SoulChef.mp3')
-    pygame.mixer.music.set_volume(0.5)
-    pygame.mixer.music.play(-1)
+    play_menu_music()
 
     screen_width, screen_height = screen.get_size()
 
-    bg_back = pygame.transform.scale(pygame.image.load('assets/MainMenuSky.png').convert(), (screen_width, screen_height))
-    bg_front = pygame.transform.scale(pygame.image.load('assets/MainMenuScreen.png').convert_alpha(), (screen_width, screen_height))
+    bg_back = ASSETS.image('assets/MainMenuSky.png', (screen_width, screen_height), alpha=False)
+    bg_front = ASSETS.image('assets/MainMenuScreen.png', (screen_width, screen_height))
 
     font = atlantaFontLarge
     
@@ -369,10 +409,10 @@ def show_intro_screen(screen):
         render_neon_title_scaled(screen, font, screen_width, y_offset=80, 
                                 scale=title_glow, time_offset=current_time)
 
-        # Pulsing prompt text
-        prompt_fade = int(abs(math.sin(current_time * 3)) * 255)
+        # Pulsing prompt text, in a few grey levels so each is rendered once
+        prompt_fade = round(abs(math.sin(current_time * 3)) * PROMPT_FADE_STEPS) * 255 // PROMPT_FADE_STEPS
         prompt_color = (prompt_fade, prompt_fade, prompt_fade)
-        prompt = font.render("Press any to continue...", True, prompt_color)
+        prompt = TEXT_CACHE.render(font, "Press any to continue...", True, prompt_color)
         screen.blit(prompt, ((screen_width - prompt.get_width()) // 2, 225))
         
 
@@ -391,7 +431,7 @@ def show_intro_screen(screen):
                 running = False
 
 
-        pygame.display.flip()
+        RENDER_TARGET.present()
         clock.tick(60)
 
 # HEALTH BAR
@@ -404,20 +444,27 @@ class HealthBar:
         self.max_health = max_health
         
         # Load images once during initialization
-        self.bg_img = self.load_health_image("assets/HealthBar.png")
-        self.fg_img = self.load_health_image("assets/Health.png")
-        self.splash_img = self.load_health_image("assets/BloodSplashClose.png")
+        self.bg_path, self.fg_path, self.splash_path = "assets/HealthBar.png", "assets/Health.png", "assets/BloodSplashClose.png"
+        self.bg_img = self.load_health_image(self.bg_path)
+        self.fg_img = self.load_health_image(self.fg_path)
+        self.splash_img = self.load_health_image(self.splash_path)
         
         # Animation variables
         self.shake_offset_x = 0
         self.shake_offset_y = 0
         self.pulse_scale = 1.0
+
+        # Background, fill, border and text composited for the current integer health
+        self.composite = None
+        self.composite_health = None
+        self.composite_margin = (0, 0)
+        self.scaled_composites = {}  # pulse scale -> scaled composite, for the current health
     
     def load_health_image(self, path):
         """Safely load health bar images with fallback"""
         try:
-            return pygame.image.load(path).convert_alpha()
-        except pygame.error as e:
+            return ASSETS.image(path)
+        except (pygame.error, FileNotFoundError) as e:
             print(f"Warning: Could not load {path}: {e}")
             return None
     
@@ -431,14 +478,36 @@ class HealthBar:
             self.shake_offset_x = 0
             self.shake_offset_y = 0
         
-        # Pulse effect when health is critical
+        # Pulse effect when health is critical, rounded so scaled composites can be reused
         if health < self.max_health * 0.15:  # Pulse when below 15% health
-            self.pulse_scale = 1.0 + 0.1 * math.sin(game_time * 0.01)
+            self.pulse_scale = round(1.0 + 0.1 * math.sin(game_time * 0.01), 2)
         else:
             self.pulse_scale = 1.0
     
-    def draw(self, screen, health, splash_timer):
-        """Draw the health bar with all effects"""
+    def build_composite(self, health):
+        """Draw background, fill, border and text for one health value onto a cached surface"""
+        health_text = f"{health}/{int(self.max_health)}"
+        text_width, text_height = moldieFont.size(health_text)
+        shadow_width, shadow_height = atlantaFont.size(health_text)
+
+        # Leave room for the 2px border and for text larger than the bar
+        margin_x = max(2, (text_width - self.width) // 2 + 1, shadow_width + 2 - self.width // 2)
+        margin_y = max(2, (text_height - self.height) // 2 + 1, shadow_height + 2 - self.height // 2)
+
+        self.composite = pygame.Surface((self.width + 2 * margin_x, self.height + 2 * margin_y), pygame.SRCALPHA)
+        self.draw_background(self.composite, margin_x, margin_y, self.width, self.height)
+        self.draw_health_fill(self.composite, margin_x, margin_y, self.width, self.height, health)
+        self.draw_border(self.composite, margin_x, margin_y, self.width, self.height, health)
+
+        self.composite_health = health
+        self.composite_margin = (margin_x, margin_y)
+        self.scaled_composites.clear()
+
+    def draw(self, screen, health, splash_timer, current_time):
+        """Draw the health bar with all effects (times in song-clock milliseconds)"""
+        if int(health) != self.composite_health:
+            self.build_composite(int(health))
+
         # Calculate positions with shake effect
         draw_x = self.x + self.shake_offset_x
         draw_y = self.y + self.shake_offset_y
@@ -450,25 +519,26 @@ class HealthBar:
         # Adjust position to keep bar centered when scaling
         scaled_x = draw_x - (scaled_width - self.width) // 2
         scaled_y = draw_y - (scaled_height - self.height) // 2
-        
-        # Draw background
-        self.draw_background(screen, scaled_x, scaled_y, scaled_width, scaled_height)
-        
-        # Draw health fill
-        self.draw_health_fill(screen, scaled_x, scaled_y, scaled_width, scaled_height, health)
-        
-        # Draw border
-        self.draw_border(screen, scaled_x, scaled_y, scaled_width, scaled_height, health)
+
+        margin_x, margin_y = self.composite_margin
+        composite = self.composite
+        if self.pulse_scale != 1.0:
+            composite = self.scaled_composites.get(self.pulse_scale)
+            if composite is None:
+                composite = resizeObject(self.composite, self.pulse_scale)
+                self.scaled_composites[self.pulse_scale] = composite
+        rect = screen.blit(composite, (scaled_x - int(margin_x * self.pulse_scale), scaled_y - int(margin_y * self.pulse_scale)))
         
         # Draw blood splash effect
-        if pygame.time.get_ticks() - splash_timer < BLOOD_SPLASH_DURATION:
-            self.draw_blood_splash(screen, scaled_x, scaled_y, scaled_width, scaled_height)
+        if current_time - splash_timer < BLOOD_SPLASH_DURATION:
+            rect = rect.union(self.draw_blood_splash(screen, scaled_x, scaled_y, scaled_width, scaled_height))
+        return rect
     
     def draw_background(self, screen, x, y, width, height):
         """Draw the health bar background"""
         if self.bg_img:
             try:
-                bg_scaled = pygame.transform.scale(self.bg_img, (width, height))
+                bg_scaled = ASSETS.image(self.bg_path, (width, height))
                 screen.blit(bg_scaled, (x, y))
             except pygame.error:
                 # Fallback to simple rectangle
@@ -489,16 +559,11 @@ class HealthBar:
         
         if self.fg_img:
             try:
-                # Create a surface for the health fill
-                fill_surface = pygame.Surface((fill_width, height), pygame.SRCALPHA)
-                
                 # Scale the foreground image to match the full bar size
-                scaled_fg = pygame.transform.scale(self.fg_img, (width, height))
+                scaled_fg = ASSETS.image(self.fg_path, (width, height))
                 
                 # Blit only the portion we need
-                fill_surface.blit(scaled_fg, (0, 0), (0, 0, fill_width, height))
-                
-                screen.blit(fill_surface, (x, y))
+                screen.blit(scaled_fg, (x, y), (0, 0, fill_width, height))
             except pygame.error:
                 # Fallback to colored rectangle
                 self.draw_colored_health_fill(screen, x, y, fill_width, height, health)
@@ -545,18 +610,21 @@ class HealthBar:
             try:
                 splash_width = width + 40
                 splash_height = height + 40
-                splash_scaled = pygame.transform.scale(self.splash_img, (splash_width, splash_height))
+                splash_scaled = ASSETS.image(self.splash_path, (splash_width, splash_height))
                 
                 # Center the splash on the health bar
                 splash_x = x - 55
                 splash_y = y - 20
                 
-                screen.blit(splash_scaled, (splash_x, splash_y))
+                return screen.blit(splash_scaled, (splash_x, splash_y))
             except pygame.error:
                 # Simple red flash fallback
                 flash_surface = pygame.Surface((width + 20, height + 20), pygame.SRCALPHA)
                 flash_surface.fill((255, 0, 0, 100))
-                screen.blit(flash_surface, (x - 10, y - 10))
+                return screen.blit(flash_surface, (x - 10, y - 10))
+        return pygame.Rect(x, y, 0, 0)
+
+RESULT_PULSE_STEPS = 2  # Steps each side of rest size: 2 gives five card and font sizes
 
 class Result:
     def __init__(self, final_score, max_score, font_path, pulse_rate=2.0, num_chunks=3):
@@ -581,7 +649,7 @@ class Result:
                 break
         return values
 
-    def draw(self, screen):
+    def draw(self, screen, time_s):
         spacing = 150
         card_width = 100
         card_height = 150
@@ -589,15 +657,15 @@ class Result:
         start_x = SCREEN_WIDTH // 2 - total_width // 2
         top_margin = 80
 
-        # Pulse effect
-        tick = pygame.time.get_ticks() / 1000
-        pulse_scale = 1 + 0.05 * math.sin(tick * self.pulse_rate)
+        # Pulse effect, snapped to a few steps so only that many faces and text sprites get cached
+        pulse = math.sin(time_s * self.pulse_rate)
+        pulse_scale = 1 + 0.05 * round(pulse * RESULT_PULSE_STEPS) / RESULT_PULSE_STEPS
 
         for i, value in enumerate(self.values):
             # Scaled dimensions
             scaled_width = int(card_width * pulse_scale)
             scaled_height = int(card_height * pulse_scale)
-            scaled_font_size = int(60 * pulse_scale)
+            scaled_font_size = round(60 * pulse_scale)
             result_font = load_font(self.font_path, scaled_font_size)
 
             # Position
@@ -613,7 +681,7 @@ class Result:
             pygame.draw.rect(screen, BLACK, card_rect, 3, border_radius=15)
 
             # Draw number centered inside card
-            text_surface = result_font.render(str(value), True, BLACK)
+            text_surface = TEXT_CACHE.render(result_font, str(value), True, BLACK)
             text_rect = text_surface.get_rect(center=(center_x, center_y))
             screen.blit(text_surface, text_rect)
 
@@ -637,25 +705,38 @@ def get_performance_rank(score, max_score):
 
 
 class RedFlag:
+    PAD = 2  # The triangle's outline spills past its corners
+
     def __init__(self, x, y, size=48, pole_height=64, pole_width=6):
         self.x = x
         self.y = y
         self.size = size
         self.pole_height = pole_height
         self.pole_width = pole_width
+        self.sprite = self.bake()
+
+    def bake(self):
+        """Draw the flag once into a transparent sprite, PAD pixels in from its corner."""
+        width = self.pole_width + self.size
+        height = max(self.pole_height, self.size)
+        sprite = pygame.Surface((width + 2 * self.PAD, height + 2 * self.PAD), pygame.SRCALPHA)
+        x = y = self.PAD
 
-    def draw(self, surface):
         # Draw golden pole
-        pole = pygame.Rect(self.x, self.y, self.pole_width, self.pole_height)
-        pygame.draw.rect(surface, GOLD, pole)
-        pygame.draw.rect(surface, BLACK, pole, 2)  # outline
+        pole = pygame.Rect(x, y, self.pole_width, self.pole_height)
+        pygame.draw.rect(sprite, GOLD, pole)
+        pygame.draw.rect(sprite, BLACK, pole, 2)  # outline
 
         # Draw blocky red triangle (right pointing)
-        p1 = (self.x + self.pole_width, self.y + 0)
-        p2 = (self.x + self.pole_width + self.size, self.y + self.size // 2)
-        p3 = (self.x + self.pole_width, self.y + self.size)
-        pygame.draw.polygon(surface, RED, [p1, p2, p3])
-        pygame.draw.polygon(surface, BLACK, [p1, p2, p3], 2)  # outline
+        p1 = (x + self.pole_width, y + 0)
+        p2 = (x + self.pole_width + self.size, y + self.size // 2)
+        p3 = (x + self.pole_width, y + self.size)
+        pygame.draw.polygon(sprite, RED, [p1, p2, p3])
+        pygame.draw.polygon(sprite, BLACK, [p1, p2, p3], 2)  # outline
+        return sprite
+
+    def draw(self, surface):
+        return surface.blit(self.sprite, (self.x - self.PAD, self.y - self.PAD))
 
 class FinishLineFlag:
     def __init__(self, x, y, cols=6, rows=4, square_size=12, pole_height=64, pole_width=6):
@@ -666,33 +747,75 @@ class FinishLineFlag:
         self.square_size = square_size
         self.pole_height = pole_height
         self.pole_width = pole_width
+        self.sprite = self.bake()
+
+    def bake(self):
+        """Draw the pole and checker pattern once into a transparent sprite."""
+        width = self.pole_width + self.cols * self.square_size
+        height = max(self.pole_height, self.rows * self.square_size)
+        sprite = pygame.Surface((width, height), pygame.SRCALPHA)
 
-    def draw(self, surface):
         # Draw golden pole
-        pole = pygame.Rect(self.x, self.y, self.pole_width, self.pole_height)
-        pygame.draw.rect(surface, GOLD, pole)
-        pygame.draw.rect(surface, BLACK, pole, 2)
+        pole = pygame.Rect(0, 0, self.pole_width, self.pole_height)
+        pygame.draw.rect(sprite, GOLD, pole)
+        pygame.draw.rect(sprite, BLACK, pole, 2)
 
         # Draw checkered pattern
         for row in range(self.rows):
             for col in range(self.cols):
                 color = BLACK if (row + col) % 2 == 0 else WHITE
                 rect = pygame.Rect(
-                    self.x + self.pole_width + col * self.square_size,
-                    self.y + row * self.square_size,
+                    self.pole_width + col * self.square_size,
+                    row * self.square_size,
                     self.square_size,
                     self.square_size
                 )
-                pygame.draw.rect(surface, color, rect)
-                pygame.draw.rect(surface, BLACK, rect, 1)  # outline
-
-# === Level Configuration ===
-LEVELS = {
-    1: {"name": "TUTORIAL", "win_threshold": 2000, "arrow_speed": 5, "note_interval_start": 1.5, "note_interval_min": 0.35, "unlocked": True, "background_func": draw_bg_0},
-    2: {"name": "Level 1", "win_threshold": 2000, "arrow_speed": 8, "note_interval_start": 1.5, "note_interval_min": 0.3, "unlocked": True, "background_func": draw_bg_1},
-    3: {"name": "Level 2", "win_threshold": 2000, "arrow_speed": 9, "note_interval_start": 1.5, "note_interval_min": 0.3, "unlocked": False, "background_func": draw_bg_2},
-    4: {"name": "Level 3", "win_threshold": 2000, "arrow_speed": 10, "note_interval_start": 1.5, "note_interval_min": 0.3, "unlocked": False, "background_func": draw_bg_3}
-}
+                pygame.draw.rect(sprite, color, rect)
+                pygame.draw.rect(sprite, BLACK, rect, 1)  # outline
+        return sprite
+
+    def draw(self, surface):
+        return surface.blit(self.sprite, (self.x, self.y))
+
+class ProgressBar:
+    """Song progress HUD: track line, elapsed time, finish flag and a moving red flag.
+
+    The track and the finish flag never change during a level, so they are
+    drawn separately for the compositor to cache; draw() covers the time and
+    the red flag, which passes between the two.
+    """
+    FLAG_RISE = 40  # Flags stand this far above the line
+    LINE_WIDTH = 4
+
+    def __init__(self, x, y, length, font):
+        self.x = x
+        self.y = y
+        self.length = length
+        self.font = font
+        self.red_flag = RedFlag(x, y - self.FLAG_RISE)
+        self.finish_flag = FinishLineFlag(x + length, y - self.FLAG_RISE)
+
+    def draw_track(self, surface):
+        return pygame.draw.line(surface, WHITE, (self.x, self.y), (self.x + self.length, self.y), self.LINE_WIDTH)
+
+    def draw_finish(self, surface):
+        return self.finish_flag.draw(surface)
+
+    def draw(self, screen, progress_time, song_length):
+        """Draw the time and the red flag for `progress_time` seconds into the song; returns the rects drawn."""
+        progress_time = max(0.0, progress_time)  # Negative during the lead-in
+        rects = []
+        time_text = TEXT_CACHE.render(self.font, f"{int(progress_time)} / {int(song_length)} sec", True, WHITE)
+        rects.append(screen.blit(time_text, (self.x, self.y - 30)))
+
+        progress_ratio = min(1.0, progress_time / song_length)
+        self.red_flag.x = self.x + int(self.length * progress_ratio)
+        rects.append(self.red_flag.draw(screen))
+        return rects
+
+# === Level Backgrounds ===
+# Gameplay settings for each level live in simulation.LEVELS
+LEVEL_BACKGROUNDS = {1: draw_bg_0, 2: draw_bg_1, 3: draw_bg_2, 4: draw_bg_3}
 
 # === Colors ===
 BLACK = (0, 0, 0)
@@ -734,17 +857,17 @@ ARROW_IMAGE_MAPPING = {
     "right": ["assets/arrowSkinRightDefault.png", "assets/arrowSkinRightGlow.png"]
 }
 
-def load_image(file_path, fallback_path=None):
+def load_image(file_path, fallback_path=None, size=None):
     try:
-        return pygame.image.load(file_path).convert_alpha()
+        return ASSETS.image(file_path, size)
     except pygame.error:
         if fallback_path:
-            return pygame.image.load(fallback_path).convert_alpha()
+            return ASSETS.image(fallback_path, size)
         raise
 
 def load_arrow_images():
     def scaled_image(path):
-        return pygame.transform.scale(load_image(path), (ARROW_SIZE, ARROW_SIZE))
+        return load_image(path, size=(ARROW_SIZE, ARROW_SIZE))
 
     arrows, glowing = {}, {}
     for direction, (default_path, glow_path) in ARROW_IMAGE_MAPPING.items():
@@ -757,16 +880,14 @@ def load_arrow_images():
 
 def load_lose_image():
     try:
-        img = pygame.image.load("assets/LOSE.png").convert_alpha()
-        return resizeObject(img, 2)
+        return ASSETS.scaled_by("assets/LOSE.png", 2)
     except pygame.error as e:
         print(f"Failed to load LOSE.png: {e}")
         return None
 
 def load_win_image():
     try:
-        img = pygame.image.load("assets/WIN.png").convert_alpha()
-        return resizeObject(img, 2)
+        return ASSETS.scaled_by("assets/WIN.png", 2)
     except pygame.error as e:
         print(f"Failed to load WIN.png: {e}")
         return None
@@ -777,59 +898,133 @@ def heartbeat_scale(base_size, pulse_rate, time_ms):
     return new_size
 
 def render_text_centered(screen, text, font, color, y_offset):
-    rendered = font.render(text, True, color)
+    rendered = TEXT_CACHE.render(font, text, True, color)
     x = (SCREEN_WIDTH - rendered.get_width()) // 2
     screen.blit(rendered, (x, y_offset))
 
-# === Note Class ===
-class Note:
-    def __init__(self, direction, x, speed):
-        self.direction = direction
-        self.x = x
-        self.y = SCREEN_HEIGHT
-        self.speed = speed
-        self.hit = self.missed = False
-        self.glow_intensity = 0
-        self.rotation = 0
-        self.scale = 1.0
-        
-    def update(self):
-        self.y -= self.speed
-        self.rotation += 0  # Gentle rotation
-        
-        # Distance-based glow effect
-        distance_to_target = abs(self.y - TARGET_Y)
-        if distance_to_target < 100:
-            self.glow_intensity = max(0, 100 - distance_to_target) / 100
-            self.scale = 1.0 + self.glow_intensity * 0.2
+# === End of Level Overlay ===
+HEARTBEAT_RATE = 3.5  # Pulse speed of the win/lose image, in radians per second
+HEARTBEAT_FRAMES = 90  # Frames in one precomputed pulse loop
+
+_dim_overlays = {}  # screen size -> translucent black layer
+_heartbeat_loops = {}  # image -> scaled frames covering one pulse
+
+def dim_overlay(size):
+    overlay = _dim_overlays.get(size)
+    if overlay is None:
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 150))
+        _dim_overlays[size] = overlay
+    return overlay
+
+def heartbeat_loop(image):
+    """Scaled frames covering one pulse of `image`, rendered once per image."""
+    loop = _heartbeat_loops.get(image)
+    if loop is None:
+        period = 2 * math.pi / HEARTBEAT_RATE
+        by_size = {}  # Neighbouring phases often round to the same size
+        loop = []
+        for i in range(HEARTBEAT_FRAMES):
+            size = heartbeat_scale(image.get_size(), HEARTBEAT_RATE, period * i / HEARTBEAT_FRAMES)
+            if size not in by_size:
+                by_size[size] = pygame.transform.smoothscale(image, size)
+            loop.append(by_size[size])
+        _heartbeat_loops[image] = loop
+    return loop
+
+def heartbeat_frame(image, time_s):
+    """The heartbeat-scaled image for `time_s`."""
+    loop = heartbeat_loop(image)
+    phase = (time_s * HEARTBEAT_RATE / (2 * math.pi)) % 1.0
+    return loop[int(phase * HEARTBEAT_FRAMES) % HEARTBEAT_FRAMES]
+
+def prepare_end_overlay():
+    """Render the win/lose heartbeat loops up front, so the level's last frame doesn't stall."""
+    for image in (LOSE_IMAGE, WIN_IMAGE):
+        if image:
+            heartbeat_loop(image)
+
+def play_end_sting(game_won):
+    """Play the win or lose sound once, when the level ends."""
+    if game_won:
+        win_effect.play(loops=0)
+    else:
+        defeat_effect.set_volume(0.5)
+        defeat_effect.play()
+
+def draw_end_overlay(screen, font, level_id, game_won, time_s, result=None):
+    """Dim the finished level and draw the lose or win screen over it, pulsing with `time_s`."""
+    screen.blit(dim_overlay(screen.get_size()), (0, 0))
+
+    if not game_won:
+        if LOSE_IMAGE:
+            scaled = heartbeat_frame(LOSE_IMAGE, time_s)
+            lose_rect = scaled.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+            screen.blit(scaled, lose_rect)
+
+        else:
+            screen.blit(TEXT_CACHE.render(pixelGameFontLarge, "GAME OVER", True, RED), (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 50))
+
+        screen.blit(TEXT_CACHE.render(pixelGameFont, "Press R to restart, M for menu, ESC to quit", True, WHITE), 
+                    (SCREEN_WIDTH // 2 - 210, SCREEN_HEIGHT // 2 + 10))
+
+    else:
+        if WIN_IMAGE:
+            scaled = heartbeat_frame(WIN_IMAGE, time_s)
+            win_rect = scaled.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+            screen.blit(scaled, win_rect)
+
+        if result:
+            result.draw(screen, time_s)
+
+        if level_id < max(LEVELS.keys()):
+            next_level_text = TEXT_CACHE.render(font, f"Level {level_id + 1} Unlocked!", True, YELLOW)
+            screen.blit(next_level_text, (SCREEN_WIDTH // 2 - next_level_text.get_width() // 2, SCREEN_HEIGHT // 2 + 20))
         
-        if self.y < TARGET_Y - 50 and not self.hit:
-            self.missed = True
-
-    def draw(self, screen, image, particles):
-        if not self.hit and not self.missed:
-            # Add trail effect when close to target
-            if self.glow_intensity > 0.3:
-                particles.add_trail(self.x, self.y, NEON_CYAN)
-            
-            # Scale and rotate the note
-            if self.scale != 1.0 or self.rotation != 0:
-                scaled_img = pygame.transform.scale(image, 
-                    (int(ARROW_SIZE * self.scale), int(ARROW_SIZE * self.scale)))
-                rotated_img = pygame.transform.rotate(scaled_img, self.rotation)
-                rect = rotated_img.get_rect(center=(self.x, self.y))
-                screen.blit(rotated_img, rect)
-            else:
-                rect = image.get_rect(center=(self.x, self.y))
-                screen.blit(image, rect)
-            
+        screen.blit(TEXT_CACHE.render(pixelGameFont, "Press R to replay, M for menu, ESC to quit", True, WHITE), 
+                    (SCREEN_WIDTH // 2 - 210, SCREEN_HEIGHT // 2 + 80))
+
+# === Note Rendering ===
+NOTE_GLOW_LEVELS = 20  # Glow intensity is drawn in this many steps
+
+_note_sprites = {}  # arrow image -> sprites indexed by glow level
+
+
+def note_sprites(image):
+    """Bake the approach animation (scale-up plus glow) of one arrow image, once per level."""
+    sprites = _note_sprites.get(image)
+    if sprites is None:
+        sprites = [image]
+        for level in range(1, NOTE_GLOW_LEVELS + 1):
+            glow_intensity = level / NOTE_GLOW_LEVELS
+            scale = 1.0 + glow_intensity * 0.2
+            sprite = pygame.Surface((ARROW_SIZE * 2, ARROW_SIZE * 2), pygame.SRCALPHA)
+
+            scaled_img = pygame.transform.scale(image, (int(ARROW_SIZE * scale), int(ARROW_SIZE * scale)))
+            sprite.blit(scaled_img, scaled_img.get_rect(center=(ARROW_SIZE, ARROW_SIZE)))
+
             # Add glow effect
-            if self.glow_intensity > 0:
-                glow_surf = pygame.Surface((ARROW_SIZE * 2, ARROW_SIZE * 2), pygame.SRCALPHA)
-                glow_color = (*NEON_CYAN[:3], int(50 * self.glow_intensity))
-                pygame.draw.circle(glow_surf, glow_color, 
-                                 (ARROW_SIZE, ARROW_SIZE), int(ARROW_SIZE * self.glow_intensity))
-                screen.blit(glow_surf, (self.x - ARROW_SIZE, self.y - ARROW_SIZE))
+            glow_surf = pygame.Surface((ARROW_SIZE * 2, ARROW_SIZE * 2), pygame.SRCALPHA)
+            glow_color = (*NEON_CYAN[:3], int(50 * glow_intensity))
+            pygame.draw.circle(glow_surf, glow_color, 
+                             (ARROW_SIZE, ARROW_SIZE), int(ARROW_SIZE * glow_intensity))
+            sprite.blit(glow_surf, (0, 0))
+            sprites.append(sprite)
+        _note_sprites[image] = sprites
+    return sprites
+
+
+def draw_note(screen, x, y, image, particles):
+    # Distance-based glow effect
+    distance_to_target = abs(y - TARGET_Y)
+    glow_intensity = max(0, 100 - distance_to_target) / 100
+
+    # Add trail effect when close to target
+    if glow_intensity > 0.3:
+        particles.add_trail(x, y, NEON_CYAN)
+
+    sprite = note_sprites(image)[round(glow_intensity * NOTE_GLOW_LEVELS)]
+    return screen.blit(sprite, sprite.get_rect(center=(x, y)))
 
 def load_progress():
     try:
@@ -849,23 +1044,12 @@ def save_progress():
     except Exception as e:
         print(f"Error saving progress: {e}")
 
-def load_beatmap(filename="beatmap.json"):
-    try:
-        with open(filename, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("Beatmap not found.")
-        return []
-    
 def play_intro(screen, clock, font, big_font):
     axel = Character(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50, SCREEN_WIDTH, SCREEN_HEIGHT, 8)
     intro_sound.set_volume(40)
     intro_sound.play()
 
-    background = pygame.transform.scale(
-        pygame.image.load('assets/City1.png').convert(), 
-        (SCREEN_WIDTH, SCREEN_HEIGHT)
-    )
+    background = ASSETS.image('assets/City1.png', (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
 
     text_lines = [
         "A long time ago...",
@@ -921,7 +1105,7 @@ def play_intro(screen, clock, font, big_font):
         # Show line with fade-in
         if current_line < len(text_lines):
             text = text_lines[current_line]
-            rendered_text = font.render(text, True, (255, 255, 255))
+            rendered_text = TEXT_CACHE.render(font, text, True, (255, 255, 255))
             fade_surface = pygame.Surface(rendered_text.get_size(), pygame.SRCALPHA)
 
             if fade_in and alpha < 255:
@@ -936,16 +1120,16 @@ def play_intro(screen, clock, font, big_font):
             screen.blit(fade_surface, text_rect)
 
         # # Add top-right "Press ENTER to skip"
-        skip_text = font.render("Press [F] to skip intro", True, (200, 200, 200))
+        skip_text = TEXT_CACHE.render(font, "Press [F] to skip intro", True, (200, 200, 200))
         screen.blit(skip_text, (SCREEN_WIDTH - skip_text.get_width() - 20, 20))
 
         # Add centered game title during final line
         if current_line == len(text_lines) - 1:
-            title_surface = big_font.render("FUNKY FLOW FRIDAY", True, (255, 215, 0))
+            title_surface = TEXT_CACHE.render(big_font, "FUNKY FLOW FRIDAY", True, (255, 215, 0))
             screen.blit(title_surface, title_surface.get_rect(center=(SCREEN_WIDTH // 2, 80)))
             intro_sound.stop()
 
-        pygame.display.flip()
+        RENDER_TARGET.present()
         clock.tick(60)
 
 def play_credits(screen, clock, font, big_font):
@@ -1006,17 +1190,17 @@ def play_credits(screen, clock, font, big_font):
 
             # Determine font
             if line.strip().upper() == "FUNKY FLOW FRIDAY":
-                text_surface = big_font.render(line, True, (255, 215, 0))
+                text_surface = TEXT_CACHE.render(big_font, line, True, (255, 215, 0))
             elif line.startswith("==="):
-                text_surface = font.render(line, True, (180, 180, 255))
+                text_surface = TEXT_CACHE.render(font, line, True, (180, 180, 255))
             else:
-                text_surface = font.render(line, True, (255, 255, 255))
+                text_surface = TEXT_CACHE.render(font, line, True, (255, 255, 255))
 
             text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, y))
             screen.blit(text_surface, text_rect)
 
         # Skip instructions
-        skip_text = font.render("Press ENTER to skip credits", True, (180, 180, 180))
+        skip_text = TEXT_CACHE.render(font, "Press ENTER to skip credits", True, (180, 180, 180))
         screen.blit(skip_text, (SCREEN_WIDTH - skip_text.get_width() - 20, 20))
 
         scroll_y -= scroll_speed
@@ -1024,15 +1208,23 @@ def play_credits(screen, clock, font, big_font):
             credit_sound.stop()
             running = False
 
-        pygame.display.flip()
+        RENDER_TARGET.present()
         clock.tick(60)
 
 
 # === Menu System ===
+_menu_glows = {}  # size -> highlight drawn behind the selected entry
+
+def menu_glow(size):
+    glow = _menu_glows.get(size)
+    if glow is None:
+        glow = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(glow, (*NEON_CYAN[:3], 30), (0, 0, *size), border_radius=10)
+        _menu_glows[size] = glow
+    return glow
+
 def show_menu(screen, clock, font, big_font):
-    pygame.mixer.music.load('BackgroundTest/SoulChef.mp3')
-    pygame.mixer.music.set_volume(0.5)
-    pygame.mixer.music.play(-1)
+    play_menu_music()
 
     menu_active = True
     selected_option = 0
@@ -1082,10 +1274,7 @@ def show_menu(screen, clock, font, big_font):
             y_pos = 200 + display_index * 60
 
             if is_selected:
-                glow_surf = pygame.Surface((400, 60), pygame.SRCALPHA)
-                glow_color = (*NEON_CYAN[:3], 30)
-                pygame.draw.rect(glow_surf, glow_color, (0, 0, 400, 60), border_radius=10)
-                screen.blit(glow_surf, (SCREEN_WIDTH//2 - 200, y_pos - 10))
+                screen.blit(menu_glow((400, 60)), (SCREEN_WIDTH//2 - 200, y_pos - 10))
 
                 color = NEON_YELLOW
                 if random.randint(1, 5) == 1:
@@ -1099,18 +1288,18 @@ def show_menu(screen, clock, font, big_font):
             if level_id == "credits" and not LEVELS[4]["unlocked"]:
                 color = GRAY
 
-            option_text = font.render(text, True, color)
+            option_text = TEXT_CACHE.render(font, text, True, color)
             position = (SCREEN_WIDTH // 2 - option_text.get_width() // 2, y_pos)
             screen.blit(option_text, position)
 
             if is_selected:
                 arrow_x = position[0] - 50 + math.sin(menu_time * 0.1) * 5
-                indicator = font.render("►", True, color)
+                indicator = TEXT_CACHE.render(font, "►", True, color)
                 screen.blit(indicator, (arrow_x, position[1]))
 
             display_index += 1
 
-        pygame.display.flip()
+        RENDER_TARGET.present()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -1145,18 +1334,14 @@ def show_menu(screen, clock, font, big_font):
                         pygame.mixer.music.stop()
                         play_intro(screen, clock, font, big_font)
                         # Resume music after intro
-                        pygame.mixer.music.load('BackgroundTest/SoulChef.mp3')
-                        pygame.mixer.music.set_volume(0.5)
-                        pygame.mixer.music.play(-1)
+                        play_menu_music()
 
                     elif level_id == "credits":
                         if LEVELS[4]["unlocked"]:
                             pygame.mixer.music.stop()
                             play_credits(screen, clock, font, big_font)
                             # Resume music after credits
-                            pygame.mixer.music.load('BackgroundTest/SoulChef.mp3')
-                            pygame.mixer.music.set_volume(0.5)
-                            pygame.mixer.music.play(-1)
+                            play_menu_music()
 
                     elif isinstance(level_id, int) and LEVELS[level_id]["unlocked"]:
                         pygame.mixer.music.stop()  # Optional: stop music before level
@@ -1168,65 +1353,54 @@ def show_menu(screen, clock, font, big_font):
 
 
 # === Game Loop ===
-def play_level(screen, clock, font, big_font, level_id):
+def play_level(screen, clock, font, big_font, level_id, replay=None):
     level_config = LEVELS[level_id]
-    arrow_speed = level_config["arrow_speed"]
     # win_threshold = level_config["win_threshold"]
-    note_interval_start = level_config["note_interval_start"]
-    note_interval_min = level_config["note_interval_min"]
 
 
     # Initialize game state variables FIRST
     global combo
-    notes, score, combo, misses, health = [], 0, 0, 0, INITIAL_HEALTH
+    score, combo, health = 0, 0, INITIAL_HEALTH
     game_over = game_won = paused = False
     current_rating = None
     rating_timer = 0
-    last_note_time = time.time()
-    note_interval = note_interval_start
-    blood_splash_timer = 0
-    result_shown = False
+    blood_splash_timer = -BLOOD_SPLASH_DURATION
+    result = None
 
 
     # Now create the HealthBar object with properly initialized variables
     HEALTH_BAR_Y = TARGET_Y - 60  # You can tweak 60 for better spacing
     health_bar = HealthBar(SCREEN_WIDTH // 2 - HEALTH_BAR_WIDTH // 2, HEALTH_BAR_Y, HEALTH_BAR_WIDTH, HEALTH_BAR_HEIGHT, MAX_HEALTH)
-
-    # Load beatmap and music based on level
-    beat_times = load_beatmap()
-    beat_index = 0
-    
-
-    if level_id == 1:
-        beat_times = load_beatmap("beatmap1.json")
-        pygame.mixer.music.load("music/eighties.mp3")
-        song_length = pygame.mixer.Sound("music/eighties.mp3").get_length()
-        pygame.mixer.music.set_volume(0.3)
-        pygame.mixer.music.play()
-
-    elif level_id == 2:
-        beat_times = load_beatmap("beatmap2.json")
-        pygame.mixer.music.load("music/8-bit-music.mp3")
-        song_length = pygame.mixer.Sound("music/8-bit-music.mp3").get_length()
-        pygame.mixer.music.set_volume(0.3)
-        pygame.mixer.music.play()
-
-
-    elif level_id == 3:
-        beat_times = load_beatmap("beatmap3.json")
-        pygame.mixer.music.load("music/Checker.mp3")
-        song_length = pygame.mixer.Sound("music/Checker.mp3").get_length()
-        pygame.mixer.music.set_volume(0.3)
-        pygame.mixer.music.play()
-
-    elif level_id == 4:
-        beat_times = load_beatmap("beatmap4.json")
-        pygame.mixer.music.load("music/Heartache.mp3")
-        song_length = pygame.mixer.Sound("music/Heartache.mp3").get_length()
-        pygame.mixer.music.set_volume(0.3)
-        pygame.mixer.music.play()
+    progress_bar = ProgressBar(PROGRESS_BAR_X, PROGRESS_BAR_Y, PROGRESS_BAR_LENGTH, font)
+
+    # A normal run is recorded; a loaded replay supplies the seed, song length and key presses
+    recording = replay is None
+    if recording:
+        replay = Replay(level_id, random.getrandbits(32), spawn_y=SCREEN_HEIGHT)
+    # Song length comes from the metadata cache instead of decoding the whole file
+    song_length = replay.song_length
+    if song_length is None:
+        song_length = SONG_CACHE.duration(level_config["song"])
+    replay_player = None if recording else ReplayPlayer(replay)
+    # Effects use the same seed, so a replay looks like the original run too
+    random.seed(replay.seed)
+
+    # Spawning, judgement, health, score and win/lose run in the simulation
+    sim = LevelSimulation(level_config, load_chart(level_config["beatmap"]), song_length,
+                          seed=replay.seed, spawn_y=replay.spawn_y)
+    song_length = replay.song_length = sim.song_length  # Estimated from the chart if the song could not be probed
+
+    music_loaded = load_music(level_config["song"], 0.3)  # Without it the clock runs on its own
+
+    # Single time source for spawning, judging, backgrounds and the progress bar.
+    # It starts at -lead_in so the first notes can scroll in before the music plays.
+    song_clock = SongClock()
+    song_clock.start(-sim.lead_in)
+    song_time = progress_time = -sim.lead_in
+    music_started = False
 
     arrows, glowing_arrows = load_arrow_images()
+    prepare_end_overlay()
 
     # Set x positions for each arrow target
     targets = {
@@ -1259,10 +1433,96 @@ def play_level(screen, clock, font, big_font, level_id):
         4
     )
 
+    # Section timings, only collected when FFF_PROFILE is set
+    profiler = FrameProfiler()
+
+    # Static backgrounds are cached and only changed rects are pushed to the display
+    bg_func = LEVEL_BACKGROUNDS.get(level_id)
+    renderer = DirtyRectRenderer(screen)
+
+    # === Layers, bottom to top ===
+    # Static layers are drawn once and flattened; the rest redraw every frame
+    def draw_background(surface):
+        if bg_func:
+            bg_func(surface, song_time * 1000)
+        else:
+            surface.fill(RED)  # Fallback background
+
+    def draw_title(surface):
+        return surface.blit(level_title, (SCREEN_WIDTH // 2 - level_title.get_width() // 2, 10))
+
+    def draw_character(surface):
+        return character.draw(surface)
+
+    def draw_targets(surface):
+        rects = []
+        for dir, data in target_arrows.items():
+            image = glowing_arrows[dir] if data["glow"] else arrows[dir]
+            rects.append(surface.blit(image, image.get_rect(center=(data["x"], TARGET_Y))))
+        return rects
+
+    def draw_target_lines(surface):
+        return [pygame.draw.line(surface, GRAY, (x - ARROW_SIZE, TARGET_Y), (x + ARROW_SIZE, TARGET_Y), 2)
+                for x in targets.values()]
+
+    def draw_notes(surface):
+        rects = []
+        for dir, lane in sim.lanes.items():
+            for note in lane:
+                y = TARGET_Y + (note.hit_time - progress_time) * sim.note_speed
+                rects.append(draw_note(surface, targets[dir], y, arrows[dir], particles))
+        return rects
+
+    def draw_hud(surface):
+        combo_text = TEXT_CACHE.render(pixelGameFontLarge, f"{combo} Combo", True, YELLOW)
+        combo_x = SCREEN_WIDTH - combo_text.get_width() - 60  # right-aligned
+        combo_y = SCREEN_HEIGHT // 2 - 40
+        rects = [surface.blit(combo_text, (combo_x, combo_y))]
+
+        rank, rank_color = get_performance_rank(score, max_score)
+        rank_text = TEXT_CACHE.render(pixelGameFontHuge, rank, True, rank_color)
+        rank_x = SCREEN_WIDTH - rank_text.get_width() - 60
+        rank_y = combo_y + combo_text.get_height() + 10
+        rects.append(surface.blit(rank_text, (rank_x, rank_y)))
+
+        rects.append(health_bar.draw(surface, health, blood_splash_timer, song_time * 1000))
+        return rects + progress_bar.draw(surface, progress_time, song_length)
+
+    def draw_rating(surface):
+        if rating_timer > 0 and current_rating:
+            return surface.blit(current_rating, current_rating.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+
+    def draw_instructions(surface):
+        instructions = TEXT_CACHE.render(pixelGameFont, "Press arrow keys when notes align with targets", True, WHITE)
+        return surface.blit(instructions, instructions.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30)))
+
+    def draw_end_screen(surface):
+        draw_end_overlay(surface, font, level_id, game_won, song_time, result)
+
+    compositor = Compositor(renderer)
+    compositor.add("background", ANIMATED if is_animated(bg_func) else STATIC, draw_background, "background")
+    compositor.add("title", STATIC, draw_title)
+    compositor.add("character", DYNAMIC, draw_character)
+    compositor.add("targets", DYNAMIC, draw_targets)
+    compositor.add("target_lines", STATIC, draw_target_lines)
+    compositor.add("notes", DYNAMIC, draw_notes, "notes")
+    compositor.add("particles", DYNAMIC, particles.draw, "particles")
+    compositor.add("progress_track", STATIC, progress_bar.draw_track)
+    compositor.add("hud", DYNAMIC, draw_hud)
+    compositor.add("finish_flag", STATIC, progress_bar.draw_finish)
+    compositor.add("rating", DYNAMIC, draw_rating)
+    compositor.add("instructions", STATIC, draw_instructions)
+    compositor.add("end_screen", ANIMATED, draw_end_screen, visible=False)  # The dim covers everything
+
     # === Game Loop ===
     running = True
     while running:
-        current_time = pygame.time.get_ticks()
+        profiler.begin_frame()
+        song_time = song_clock.update()
+        if not music_started and song_time >= 0:
+            if music_loaded:
+                pygame.mixer.music.play()
+            music_started = True
 
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
@@ -1271,77 +1531,76 @@ def play_level(screen, clock, font, big_font, level_id):
             elif e.type == pygame.KEYDOWN: 
                 if e.key == pygame.K_ESCAPE:
                     pygame.mixer.music.stop()
+                    if not (game_over or game_won):
+                        profiler.export(level=level_id, outcome="quit", assets=ASSETS.stats())
                     return "menu"
+                if e.key == pygame.K_F3:
+                    profiler.toggle_graph()
                 if (game_over or game_won) and e.key == pygame.K_r:
-                    return play_level(screen, clock, font, big_font, level_id)  # Restart level
+                    # Restart level (a replay starts over from its first press)
+                    return play_level(screen, clock, font, big_font, level_id, None if recording else replay)
                 if (game_over or game_won) and e.key == pygame.K_m:
                     pygame.mixer.music.stop()
                     return "menu"
-                if not (game_over or game_won):
+                if recording and not (game_over or game_won):
                     direction = KEY_BINDINGS.get(e.key)
                     if direction:
                         target_arrows[direction]["glow"] = True
                         target_arrows[direction]["timer"] = GLOW_DURATION
-                        hit = False
-                        for note in notes:
-                            if note.direction == direction and not note.hit and not note.missed:
-                                distance = abs(note.y - TARGET_Y)
-                                if distance < 17:
-                                    score += 100
-                                    combo += 1
-                                    current_rating = ratings["perfect"]
-                                    health = min(MAX_HEALTH, health + 10)
-                                elif distance < 40:
-                                    score += 50
-                                    combo += 1
-                                    current_rating = ratings["good"]
-                                    health = min(MAX_HEALTH, health + 5)
-                                elif distance < 60:
-                                    score += 10
-                                    combo = 0
-                                    current_rating = ratings["bad"]
-                                    health = min(MAX_HEALTH, health + 2)
-                                else:
-                                    continue
-                                note.hit = True
-                                hit = True
-                                rating_timer = RATING_DISPLAY_TIME
-                                break
-                        if not hit:
-                            rating_timer = RATING_DISPLAY_TIME
-                            health = max(0, health)
- 
-
-        # Check win/loss conditions
-        current_time = pygame.mixer.music.get_pos() / 1000.0
-        if current_time >= song_length - 0.5:
-            game_won, paused = True, True
-            pygame.mixer.music.stop()
-            
-            if level_id < max(LEVELS.keys()):
-                LEVELS[level_id + 1]["unlocked"] = True
-                save_progress()
-
-        if health <= 0:
-            pygame.mixer.music.stop()
-            game_over, paused = True, True
-            
+                        rating_timer = RATING_DISPLAY_TIME
+                        replay.record(direction, song_time)
+                        sim.press(direction, song_time)
+
+        # Replayed presses are judged at their recorded song time, not the frame time
+        if replay_player and not (game_over or game_won):
+            for press_time, direction in replay_player.presses_until(song_time):
+                target_arrows[direction]["glow"] = True
+                target_arrows[direction]["timer"] = GLOW_DURATION
+                rating_timer = RATING_DISPLAY_TIME
+                sim.press(direction, press_time)
+        profiler.mark("events")
+
+        # Spawn, expire and check win/loss up to the current song time
+        if not paused:
+            sim.advance(song_time)
+
+        for event, event_time in sim.pop_events():
+            if event in ratings:
+                current_rating = ratings[event]
+                rating_timer = RATING_DISPLAY_TIME
+            if event == "miss":
+                blood_splash_timer = event_time * 1000
+                miss_note.play()
+            elif event == "won":
+                game_won, paused = True, True
+                pygame.mixer.music.stop()
+                song_clock.stop()
 
-        # Spawn notes at intervals
+                if recording and level_id < max(LEVELS.keys()):
+                    LEVELS[level_id + 1]["unlocked"] = True
+                    save_progress()
+            elif event == "lost":
+                pygame.mixer.music.stop()
+                song_clock.stop()
+                game_over, paused = True, True
+
+            if event in ("won", "lost"):
+                if event == "won":
+                    result = Result(sim.score, max_score, "assets/PixelGame.otf")
+                compositor.set_visible("instructions", False)
+                compositor.set_visible("end_screen", True)
+                play_end_sting(event == "won")
+                profiler.export(level=level_id, outcome=event, assets=ASSETS.stats())
+                if recording:
+                    replay.result = sim.summary()
+                    replay.save()
+
+        score, combo, health = sim.score, sim.combo, sim.health
+        profiler.mark("simulation")
+
+        # The progress bar and notes stop where the song did
         if not paused:
-            if time.time() - last_note_time > note_interval:
-                direction = random.choice(list(targets.keys()))
-                notes.append(Note(direction, targets[direction], arrow_speed))
-                last_note_time = time.time()
-                note_interval = max(note_interval_min, note_interval * 0.99)
-        
-        # Spawn notes based on beat timestamps
-        current_time_sec = pygame.mixer.music.get_pos() / 1000.0
-        if not paused and beat_index < len(beat_times):
-            if current_time_sec >= beat_times[beat_index]:
-                direction = random.choice(list(targets.keys()))
-                notes.append(Note(direction, targets[direction], arrow_speed))
-                beat_index += 1
+            progress_time = song_time
 
         # Update glow timers
         for ta in target_arrows.values():
@@ -1350,160 +1609,27 @@ def play_level(screen, clock, font, big_font, level_id):
                 if ta["timer"] == 0:
                     ta["glow"] = False
 
-        # Update and remove notes
-        if not paused:
-            for note in notes[:]:
-                note.update()
-                if note.missed:
-                    # misses += 1
-                    score = max(0, score - 50)
-                    combo = 0
-                    current_rating = ratings["miss"]
-                    rating_timer = RATING_DISPLAY_TIME
-                    health = max(0, health - 5)
-                    blood_splash_timer = pygame.time.get_ticks()
-                    miss_note.play()
-                if note.y < 0 or note.hit:
-                    notes.remove(note)
-
         if rating_timer > 0:
             rating_timer -= 1
 
-        # Update particles
+        # Update particles, the character and the health bar
         particles.update()
+        character.update(pygame.key.get_pressed())
+        health_bar.update(health, song_time)
+        profiler.mark("update")
 
         # === Drawing Section ===
-        # Use background function for this level
-        bg_func = level_config.get("background_func")
-        if bg_func:
-            bg_func(screen)
-
-        else:
-            screen.fill(RED)  # Fallback background
-            print("Drawing red background...")
-
-        keys = pygame.key.get_pressed()
-        character.update(keys)
-        character.draw(screen)
-
-        # Level title at the top
-        screen.blit(level_title, (SCREEN_WIDTH // 2 - level_title.get_width() // 2, 10))
-
-        # Draw target arrows
-        for dir, data in target_arrows.items():
-            image = glowing_arrows[dir] if data["glow"] else arrows[dir]
-            rect = image.get_rect(center=(data["x"], TARGET_Y))
-            screen.blit(image, rect)
-            pygame.draw.line(screen, GRAY, (data["x"] - ARROW_SIZE, TARGET_Y), (data["x"] + ARROW_SIZE, TARGET_Y), 2)
-
-        # Draw falling notes
-        for note in notes:
-            note.draw(screen, arrows[note.direction], particles)
-
-        # Draw particles
-        particles.draw(screen)
-
-        # UI: Score, combo, misses, health
-        # screen.blit(font.render(f"Score: {score}/{max_score}", True, WHITE), (20, 20))
-        # screen.blit(font.render(f"Combo: {combo}", True, WHITE), (20, 60))
-        # screen.blit(font.render(f"Misses: {misses}", True, WHITE), (20, 100))
-
-        combo_text = pixelGameFontLarge.render(f"{combo} Combo", True, YELLOW)
-        combo_x = SCREEN_WIDTH - combo_text.get_width() - 60  # right-aligned
-        combo_y = SCREEN_HEIGHT // 2 - 40
-        screen.blit(combo_text, (combo_x, combo_y))
-
-        rank, rank_color = get_performance_rank(score, max_score)
-        rank_text = pixelGameFontHuge.render(rank, True, rank_color)
-        rank_x = SCREEN_WIDTH - rank_text.get_width() - 60
-        rank_y = combo_y + combo_text.get_height() + 10
-        screen.blit(rank_text, (rank_x, rank_y))
-
-        # Update and draw health bar
-        health_bar.update(health, current_time)
-        health_bar.draw(screen, health, blood_splash_timer)
-
-        # Progress bar toward win
-        # Draw progress bar line
-        pygame.draw.line(screen, WHITE, (PROGRESS_BAR_X, PROGRESS_BAR_Y), 
-                        (PROGRESS_BAR_X + PROGRESS_BAR_LENGTH, PROGRESS_BAR_Y), 4)
-
-        # Calculate red flag position
-        current_time_sec = pygame.mixer.music.get_pos() / 1000.0
-        progress_ratio = min(1.0, current_time_sec / song_length)
-        red_flag_x = PROGRESS_BAR_X + int(PROGRESS_BAR_LENGTH * progress_ratio)
-        f"{int(current_time_sec)} / {int(song_length)} sec"
-        time_text = font.render(f"{int(current_time_sec)} / {int(song_length)} sec", True, WHITE)
-        screen.blit(time_text, (PROGRESS_BAR_X, PROGRESS_BAR_Y - 30))
-
-        # Draw flags
-        red_flag = RedFlag(red_flag_x, PROGRESS_BAR_Y - 40)
-        finish_flag = FinishLineFlag(PROGRESS_BAR_X + PROGRESS_BAR_LENGTH, PROGRESS_BAR_Y - 40)
-
-        red_flag.draw(screen)
-        finish_flag.draw(screen)
-
-        # Display rating
-        if rating_timer > 0 and current_rating:
-            rect = current_rating.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            screen.blit(current_rating, rect)
-
-        # === Game Over or Win Screens ===
-        if game_over or game_won:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))
-            screen.blit(overlay, (0, 0))
-
-            tickSpeed = pygame.time.get_ticks() / 1000
-
-            if game_over:
-                if LOSE_IMAGE:
-                    size = heartbeat_scale(LOSE_IMAGE.get_size(), pulse_rate=3.5, time_ms=tickSpeed)
-                    scaled = pygame.transform.smoothscale(LOSE_IMAGE, size)
-                    defeat_effect.set_volume(0.5)
-                    defeat_effect.play()
-                    lose_rect = scaled.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-                    screen.blit(scaled, lose_rect)
-
-                else:
-                    screen.blit(pixelGameFontLarge.render("GAME OVER", True, RED), (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 50))
-
-                screen.blit(pixelGameFont.render("Press R to restart, M for menu, ESC to quit", True, WHITE), 
-                            (SCREEN_WIDTH // 2 - 210, SCREEN_HEIGHT // 2 + 10))
-
-            elif game_won:
-                # screen.blit(pixelGameFontLarge.render("LEVEL COMPLETE!", True, GREEN), 
-                #             (SCREEN_WIDTH // 2 - 50 , SCREEN_HEIGHT // 2 - 50))
-                
-                if WIN_IMAGE:
-                    size = heartbeat_scale(WIN_IMAGE.get_size(), pulse_rate=3.5, time_ms=tickSpeed)
-                    scaled = pygame.transform.smoothscale(WIN_IMAGE, size)
-                    win_effect.play(loops=0)
-                    win_rect = scaled.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-                    screen.blit(scaled, win_rect)
-                
-                if not result_shown:
-                    result = Result(score, max_score, "assets/PixelGame.otf")
-                    result_shown = True
-
-                if result_shown:
-                    result.draw(screen)
-
-
-                if level_id < max(LEVELS.keys()):
-                    next_level_text = font.render(f"Level {level_id + 1} Unlocked!", True, YELLOW)
-                    screen.blit(next_level_text, (SCREEN_WIDTH // 2 - next_level_text.get_width() // 2, SCREEN_HEIGHT // 2 + 20))
-                
-                screen.blit(pixelGameFont.render("Press R to replay, M for menu, ESC to quit", True, WHITE), 
-                            (SCREEN_WIDTH // 2 - 210, SCREEN_HEIGHT // 2 + 80))
-
-        # Instruction line
-        else:
-            instructions = pixelGameFont.render("Press arrow keys when notes align with targets", True, WHITE)
-            screen.blit(instructions, instructions.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30)))
-
-        pygame.display.flip()
+        compositor.draw(profiler.mark)
+        profiler.mark("hud")
+
+        if profiler.show_graph:
+            profiler.draw_graph(screen)
+            renderer.invalidate()
+        renderer.present()
+        profiler.mark("flip")
         clock.tick(60)
+        profiler.mark("tick")
+        profiler.end_frame()
 
     return "menu"
 
@@ -1512,7 +1638,7 @@ def main():
     pygame.init()
     pygame.font.init()
 
-    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    screen = RENDER_TARGET.open((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("FUNKY FLOW FRIDAY")
     clock = pygame.time.Clock()
 
@@ -1541,6 +1667,22 @@ def main():
         else:
             game_state = play_level(screen, clock, font, big_font, game_state)
 
+def run_replay(replay):
+    """Watch a recorded session in its own window."""
+    pygame.init()
+    pygame.font.init()
+
+    screen = RENDER_TARGET.open((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("FUNKY FLOW FRIDAY - REPLAY")
+    clock = pygame.time.Clock()
+
+    global LOSE_IMAGE, WIN_IMAGE
+    LOSE_IMAGE = load_lose_image()
+    WIN_IMAGE = load_win_image()
+
+    play_level(screen, clock, moldieFont, atlantaFontLarge, replay.level_id, replay)
+    pygame.quit()
+
 # Run the game
 def run_game():
     main()
@@ -0,0 +1,98 @@
+import math
+
+import pygame
+
+
+class AssetRegistry:
+    """Process-wide image cache.
+
+    Every file is read from disk once and converted to the display format.
+    Scaled and tinted variants are memoized by (path, size, alpha, tint), so
+    restarting a level or rebuilding a sprite costs a dictionary lookup
+    instead of a load and a transform. Images requested before the display
+    exists are converted on their first use after it opens.
+    """
+
+    def __init__(self):
+        self._surfaces = {}
+        self._unconverted = set()  # Keys cached before the display existed
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, path, size=None, alpha=True, tint=None):
+        """Return the image at `path`, optionally scaled to `size` and RGB-multiplied by `tint`."""
+        key = (path, size, alpha, tint)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            if key in self._unconverted and pygame.display.get_surface() is not None:
+                surface = self._surfaces[key] = surface.convert_alpha() if alpha else surface.convert()
+                self._unconverted.discard(key)
+            return surface
+        self.misses += 1
+
+        if pygame.display.get_surface() is None:
+            self._unconverted.add(key)
+        if size is None and tint is None:
+            surface = pygame.image.load(path)
+            if key not in self._unconverted:
+                surface = surface.convert_alpha() if alpha else surface.convert()
+        else:
+            surface = self.image(path, alpha=alpha)
+            if size is not None and size != surface.get_size():
+                surface = pygame.transform.scale(surface, size)
+            if tint is not None:
+                surface = surface.copy()
+                surface.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+
+        self._surfaces[key] = surface
+        return surface
+
+    def scaled_by(self, path, factor, alpha=True):
+        """Return the image at `path` scaled by `factor`, like pygame.transform.scale_by."""
+        width, height = self.image(path, alpha=alpha).get_size()
+        return self.image(path, (int(width * factor), int(height * factor)), alpha)
+
+    def memory_bytes(self):
+        return sum(s.get_pitch() * s.get_height() for s in self._surfaces.values())
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "surfaces": len(self._surfaces),
+            "memory_bytes": self.memory_bytes(),
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+        self._unconverted.clear()
+
+
+class ScaleLadder:
+    """Copies of one image pre-scaled at geometric steps between two factors.
+
+    Built once when a background initializes; get() snaps a factor to the
+    nearest step in constant time, so sprites that grow or pulse every frame
+    blit a stored surface instead of calling pygame.transform.scale. The
+    surfaces are shared, so set their alpha right before blitting them.
+    """
+
+    def __init__(self, image, low, high, ratio=1.02):
+        self.low = low
+        self._log_ratio = math.log(ratio)
+        count = math.ceil(math.log(high / low) / self._log_ratio) + 1
+        width, height = image.get_size()
+        self.steps = []
+        for i in range(count):
+            factor = min(low * ratio ** i, high)  # The top step is `high`, not one ratio past it
+            self.steps.append(pygame.transform.scale(image, (int(width * factor), int(height * factor))))
+
+    def get(self, factor):
+        if factor <= self.low:
+            return self.steps[0]
+        i = round(math.log(factor / self.low) / self._log_ratio)
+        return self.steps[min(i, len(self.steps) - 1)]
+
+
+ASSETS = AssetRegistry()
@@ -0,0 +1,382 @@
+"""Headless rendering benchmark for every scene.
+
+Runs each scene under the SDL dummy drivers for a fixed number of frames with
+a seeded RNG and scripted input, with frame pacing switched off, and reports
+frame-time percentiles and surfaces allocated per frame as JSON, followed by
+the asset registry's hit/miss counts and memory:
+
+    python benchmark.py --output bench.json
+    python benchmark.py --baseline bench.json --max-regression 0.2
+
+Allocations counted are pygame.Surface() plus every builtin that returns a new
+Surface (copy, convert, subsurface, transforms, image loads, surfarray,
+Font.render); the calls are seen through a profile hook, which adds its
+overhead to every frame. The level scenes play back an AutoPlayer run of the
+level. Missing audio files are listed rather than stopping the run. Set
+FFF_RENDER_HEIGHT to measure a scaled canvas.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Keeps stdout to the JSON report
+
+import numpy as np
+import pygame
+
+from simulation import AutoPlayer
+
+FRAME_MS = 1000 / 60
+
+# === Instrumentation ===
+# Builtins that return a new Surface, by the class or module they are called on
+ALLOCATING_METHODS = {
+    pygame.Surface: ("copy", "convert", "convert_alpha", "subsurface"),
+    pygame.font.Font: ("render",),
+    pygame.mask.Mask: ("to_surface",),
+}
+ALLOCATING_FUNCTIONS = {
+    "pygame.transform": ("scale", "smoothscale", "scale_by", "smoothscale_by", "rotate", "rotozoom", "flip",
+                         "chop", "laplacian", "grayscale", "average_surfaces"),
+    "pygame.image": ("load", "load_basic", "load_extended", "frombytes", "fromstring", "frombuffer"),
+    "pygame.pixelcopy": ("make_surface",),  # Behind surfarray.make_surface
+}
+allocations = Counter()
+
+
+class _CountedSurface(pygame.Surface):
+    # The constructor is a type call, which the profile hook does not see
+    def __init__(self, *args, **kwargs):
+        allocations["Surface"] += 1
+        super().__init__(*args, **kwargs)
+
+
+def _allocation_kind(function):
+    """Name the kind of Surface a builtin call allocates, or None if it allocates none."""
+    owner = getattr(function, "__self__", None)
+    name = function.__name__
+    for cls, names in ALLOCATING_METHODS.items():
+        if isinstance(owner, cls):
+            return f"{cls.__name__}.{name}" if name in names else None
+    module = getattr(owner, "__name__", None)
+    if name in ALLOCATING_FUNCTIONS.get(module, ()):
+        return f"{module.removeprefix('pygame.')}.{name}"
+    return None
+
+
+def _count_allocations(frame, event, function):
+    if event == "c_call":
+        kind = _allocation_kind(function)
+        if kind:
+            allocations[kind] += 1
+
+
+class _UnthrottledClock:
+    """Stands in for pygame.time.Clock so frames run back to back."""
+
+    def __init__(self):
+        self._last = time.perf_counter()
+        self._elapsed = 0
+
+    def tick(self, framerate=0):
+        now = time.perf_counter()
+        self._elapsed = int((now - self._last) * 1000)
+        self._last = now
+        return self._elapsed
+
+    tick_busy_loop = tick
+
+    def get_time(self):
+        return self._elapsed
+
+    def get_rawtime(self):
+        return self._elapsed
+
+    def get_fps(self):
+        return 1000 / self._elapsed if self._elapsed else 0.0
+
+
+def install_instrumentation():
+    # Installed before Main is imported, in case it binds these names at import
+    pygame.Surface = _CountedSurface
+    pygame.time.Clock = _UnthrottledClock
+
+
+class FrameRecorder:
+    """Hooks display.flip and display.update to time frames, count allocations and post scripted input."""
+
+    def __init__(self):
+        self._flip = pygame.display.flip
+        self._update = pygame.display.update
+        pygame.display.flip = self.flip
+        pygame.display.update = self.update
+        self.active = False
+
+    def start(self, frames, warmup, script=None, exit_event=None):
+        self.frames, self.warmup = frames, warmup
+        self.script, self.exit_event = script, exit_event
+        self.count = 0
+        self.times = []
+        self.per_frame = []
+        self._last_time = time.perf_counter()
+        self._last_allocations = Counter(allocations)
+        self.active = True
+        sys.setprofile(_count_allocations)
+
+    @property
+    def done(self):
+        return self.count >= self.warmup + self.frames
+
+    def flip(self, *args):
+        self._flip(*args)
+        self.end_frame()
+
+    def update(self, *args):
+        self._update(*args)
+        self.end_frame()
+
+    def end_frame(self):
+        if not self.active:
+            return
+        now = time.perf_counter()
+        if self.warmup <= self.count < self.warmup + self.frames:
+            self.times.append((now - self._last_time) * 1000)
+            self.per_frame.append(allocations - self._last_allocations)
+        self._last_time = now
+        self._last_allocations = Counter(allocations)
+        self.count += 1
+
+        if self.script:
+            for event in self.script(self.count):
+                pygame.event.post(event)
+        if self.done and self.exit_event is not None:
+            pygame.event.post(self.exit_event)
+
+    def stop(self):
+        sys.setprofile(None)
+        self.active = False
+        times = np.array(self.times)
+        p50, p95, p99 = np.percentile(times, [50, 95, 99])
+        totals = sum(self.per_frame, Counter())
+        return {
+            "frames": len(times),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "mean_ms": round(float(times.mean()), 3),
+            "max_ms": round(float(times.max()), 3),
+            "surfaces_per_frame": round(sum(totals.values()) / len(times), 2),
+            "allocations_per_frame": {kind: round(n / len(times), 2) for kind, n in sorted(totals.items())},
+        }
+
+
+def key_event(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+
+
+def set_combo(value):
+    # The level backgrounds read the combo from the __main__ module
+    sys.modules["__main__"].combo = value
+
+
+# === Scenes ===
+def scene_intro(game, screen, recorder, frames, warmup):
+    recorder.start(frames, warmup, exit_event=key_event(pygame.K_f))
+    game.play_intro(screen, pygame.time.Clock(), game.pixelGameFontLarge, game.pixelGameFontHuge)
+
+
+def scene_intro_screen(game, screen, recorder, frames, warmup):
+    recorder.start(frames, warmup, exit_event=key_event(pygame.K_SPACE))
+    game.show_intro_screen(screen)
+
+
+def scene_menu(game, screen, recorder, frames, warmup):
+    # Walk the cursor down and back up; once done, return to the top entry (level 1) and select it
+    moved_down = False
+
+    def script(frame):
+        nonlocal moved_down
+        if recorder.done:
+            if moved_down:
+                moved_down = False
+                yield key_event(pygame.K_UP)
+            yield key_event(pygame.K_RETURN)
+        elif frame % 15 == 0:
+            yield key_event(pygame.K_UP if moved_down else pygame.K_DOWN)
+            moved_down = not moved_down
+
+    recorder.start(frames, warmup, script)
+    game.show_menu(screen, pygame.time.Clock(), game.moldieFont, game.atlantaFontLarge)
+
+
+def background_scene(level_id):
+    def scene(game, screen, recorder, frames, warmup):
+        draw = game.LEVEL_BACKGROUNDS[level_id]
+        recorder.start(frames, warmup)
+        frame = 0
+        while not recorder.done:
+            set_combo((frame // 6) % 40)  # Rising combos cross the milestone and gold-speaker effects
+            draw(screen, frame * FRAME_MS)
+            game.RENDER_TARGET.present()
+            frame += 1
+        set_combo(0)
+    return scene
+
+
+def scene_particle_storm(game, screen, recorder, frames, warmup):
+    particles = game.ParticleSystem()
+    width, height = screen.get_size()
+    colors = [game.NEON_CYAN, game.NEON_VIOLET, game.NEON_RED, game.NEON_YELLOW]
+    recorder.start(frames, warmup)
+    frame = 0
+    while not recorder.done:
+        for i in range(4):
+            particles.add_explosion((frame * 97 + i * 311) % width, (frame * 53 + i * 197) % height,
+                                    colors[(frame + i) % len(colors)], count=20)
+        particles.add_trail(width // 2, height // 2, game.NEON_GREEN, count=10)
+        screen.fill(game.BLACK)
+        particles.update()
+        particles.draw(screen)
+        game.RENDER_TARGET.present()
+        frame += 1
+
+
+def overlay_scene(game_won):
+    def scene(game, screen, recorder, frames, warmup):
+        result = game.Result(1500, game.max_score, "assets/PixelGame.otf") if game_won else None
+        game.prepare_end_overlay()
+        recorder.start(frames, warmup)
+        frame = 0
+        while not recorder.done:
+            game.draw_bg_0(screen)
+            game.draw_end_overlay(screen, game.moldieFont, 1, game_won, frame * FRAME_MS / 1000, result)
+            game.RENDER_TARGET.present()
+            frame += 1
+    return scene
+
+
+def autoplay_replay(game, level_id, seed):
+    """Record an AutoPlayer run of the level for play_level to play back."""
+    level_config = game.LEVELS[level_id]
+    replay = game.Replay(level_id, seed, spawn_y=game.SCREEN_HEIGHT)
+    sim = game.LevelSimulation(level_config, game.load_chart(level_config["beatmap"]),
+                               game.SONG_CACHE.duration(level_config["song"]), seed=seed, spawn_y=replay.spawn_y)
+    player = AutoPlayer(seed=seed)
+    song_time = sim.time
+    while not sim.finished:
+        song_time += FRAME_MS / 1000
+        for press_time, direction in player.presses_until(sim, song_time):
+            replay.record(direction, press_time)
+            sim.press(direction, press_time)
+        sim.advance(song_time)
+    replay.song_length = sim.song_length
+    return replay
+
+
+def level_scene(level_id):
+    def scene(game, screen, recorder, frames, warmup):
+        replay = autoplay_replay(game, level_id, game.random.getrandbits(32))
+        # Song time follows the frame count, so notes scroll at 60 FPS however fast the frames run
+        song_clock = game.SongClock
+        game.SongClock = lambda: song_clock(position_source=None, timer=lambda: recorder.count * FRAME_MS / 1000)
+        recorder.start(frames, warmup, exit_event=key_event(pygame.K_ESCAPE))
+        try:
+            game.play_level(screen, pygame.time.Clock(), game.moldieFont, game.atlantaFontLarge, level_id, replay)
+        finally:
+            game.SongClock = song_clock
+    return scene
+
+
+SCENES = {
+    "intro": scene_intro,
+    "intro_screen": scene_intro_screen,
+    "menu": scene_menu,
+    "bg_0": background_scene(1),
+    "bg_1": background_scene(2),
+    "bg_2": background_scene(3),
+    "bg_3": background_scene(4),
+    "particle_storm": scene_particle_storm,
+    "lose_overlay": overlay_scene(False),
+    "win_overlay": overlay_scene(True),
+    "level_1": level_scene(1),
+    "level_4": level_scene(4),
+}
+
+
+# === Reporting ===
+def compare(results, baseline, max_regression):
+    """Print per-scene changes against a baseline; returns the names of regressed scenes."""
+    regressed = []
+    print(f"{'scene':<16}{'p95 ms':>10}{'base':>10}{'change':>10}{'surf/f':>10}{'base':>10}", file=sys.stderr)
+    for name, scene in results["scenes"].items():
+        base = baseline.get("scenes", {}).get(name)
+        if base is None:
+            print(f"{name:<16}{scene['p95_ms']:>10.2f}{'-':>10}", file=sys.stderr)
+            continue
+        change = scene["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        print(f"{name:<16}{scene['p95_ms']:>10.2f}{base['p95_ms']:>10.2f}{change:>+10.1%}"
+              f"{scene['surfaces_per_frame']:>10.1f}{base['surfaces_per_frame']:>10.1f}", file=sys.stderr)
+        if max_regression is not None and change > max_regression:
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every scene headlessly.")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenes", nargs="+", choices=sorted(SCENES), default=list(SCENES))
+    parser.add_argument("--output", help="write results to this file instead of stdout")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--max-regression", type=float,
+                        help="exit with status 1 if any scene's p95 grew by more than this fraction")
+    args = parser.parse_args()
+
+    install_instrumentation()
+    import Main as game
+
+    screen = game.RENDER_TARGET.open((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    game.LOSE_IMAGE = game.load_lose_image()
+    game.WIN_IMAGE = game.load_win_image()
+    recorder = FrameRecorder()
+
+    results = {
+        "resolution": list(game.RENDER_TARGET.window.get_size()),
+        "render_size": list(screen.get_size()),
+        "pygame": pygame.version.ver,
+        "seed": args.seed,
+        "scenes": {},
+    }
+    for name in args.scenes:
+        game.random.seed(args.seed)
+        pygame.event.clear()
+        SCENES[name](game, screen, recorder, args.frames, args.warmup)
+        results["scenes"][name] = recorder.stop()
+        pygame.mixer.stop()
+        pygame.mixer.music.stop()
+    results["assets"] = game.ASSETS.stats()
+    results["missing_audio"] = sorted(game.MISSING_AUDIO)  # Played as silence
+
+    report = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report)
+    else:
+        print(report)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressed = compare(results, json.load(f), args.max_regression)
+        if regressed:
+            print(f"Regressed: {', '.join(regressed)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import json
+
+import numpy as np
+
+# Lane order used by the compiled arrays
+LANES = ("left", "down", "up", "right")
+LANE_INDEX = {direction: i for i, direction in enumerate(LANES)}
+
+# Note flags
+FLAG_RANDOM_LANE = 1  # The beatmap gave no direction, so the lane is dealt at level start
+
+
+class Chart:
+    """A beatmap compiled into parallel typed arrays sorted by time."""
+
+    def __init__(self, times, lanes, flags):
+        self.times = times  # float64 seconds
+        self.lanes = lanes  # int8 index into LANES, -1 until dealt
+        self.flags = flags  # uint8 bit field
+
+    def __len__(self):
+        return len(self.times)
+
+    @classmethod
+    def from_beatmap(cls, entries):
+        """Compile a beatmap list of plain times or {"time", "direction"} dicts."""
+        times = np.empty(len(entries), dtype=np.float64)
+        lanes = np.full(len(entries), -1, dtype=np.int8)
+        flags = np.zeros(len(entries), dtype=np.uint8)
+
+        for i, entry in enumerate(entries):
+            if isinstance(entry, dict):
+                times[i] = entry["time"]
+                direction = entry.get("direction")
+                if direction in LANE_INDEX:
+                    lanes[i] = LANE_INDEX[direction]
+                    continue
+            else:
+                times[i] = entry
+            flags[i] = FLAG_RANDOM_LANE
+
+        order = np.argsort(times, kind="stable")
+        return cls(times[order], lanes[order], flags[order])
+
+    def deal_lanes(self, rng):
+        """Return a copy with every random-lane note given a lane from `rng`."""
+        lanes = self.lanes.copy()
+        random_lane = (self.flags & FLAG_RANDOM_LANE).astype(bool)
+        lanes[random_lane] = rng.integers(0, len(LANES), size=int(random_lane.sum()))
+        return Chart(self.times, lanes, self.flags)
+
+    def index_at(self, song_time):
+        """Index of the first note at or after `song_time` (binary search)."""
+        return int(np.searchsorted(self.times, song_time, side="left"))
+
+
+class ChartCursor:
+    """Walks a Chart in time order, handing out due notes in slices."""
+
+    def __init__(self, chart, song_time=0.0):
+        self.chart = chart
+        self.position = 0
+        self.seek(song_time)
+
+    def seek(self, song_time):
+        """Move the cursor so the next note is the first one at or after `song_time`."""
+        self.position = self.chart.index_at(song_time)
+
+    def take_until(self, song_time):
+        """Return (times, lanes, flags) views of every note due up to `song_time`."""
+        start = self.position
+        end = int(np.searchsorted(self.chart.times, song_time, side="right"))
+        if end <= start:
+            end = start
+        self.position = end
+        return self.chart.times[start:end], self.chart.lanes[start:end], self.chart.flags[start:end]
+
+    def done(self):
+        return self.position >= len(self.chart)
+
+
+_compiled_charts = {}
+
+
+def load_chart(filename):
+    """Load and compile a beatmap file once; later calls reuse the compiled arrays."""
+    chart = _compiled_charts.get(filename)
+    if chart is None:
+        try:
+            with open(filename, 'r') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            print("Beatmap not found.")
+            entries = []
+        chart = _compiled_charts[filename] = Chart.from_beatmap(entries)
+    return chart
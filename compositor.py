@@ -0,0 +1,146 @@
+"""Layered frame composition on top of the dirty-rect renderer.
+
+A frame is a stack of named layers drawn bottom to top. Each layer is
+
+  STATIC    drawn once into a cached surface and reused until invalidated
+  ANIMATED  repainted in full every frame, so frames are presented whole
+  DYNAMIC   redrawn every frame, reporting the rects it touched
+
+Adjacent static layers are flattened together. The run at the bottom of the
+stack becomes the DirtyRectRenderer's cached background and is restored with
+it; a run higher up is kept as cropped transparent sprites, one blit each per
+frame however many draw calls went into it.
+"""
+import pygame
+
+STATIC, ANIMATED, DYNAMIC = "static", "animated", "dynamic"
+
+
+def _rect_list(drawn):
+    """Normalize a draw function's result (a rect, a list of rects or None)."""
+    if not drawn:
+        return []
+    if isinstance(drawn, pygame.Rect):
+        return [drawn]
+    return [pygame.Rect(r) for r in drawn if r]
+
+
+def _merge_overlapping(rects):
+    """Union rects until none overlap, so no pixel of a sprite is blitted twice."""
+    merged = []
+    for rect in rects:
+        while True:
+            i = rect.collidelist(merged)
+            if i < 0:
+                break
+            rect = rect.union(merged.pop(i))
+        merged.append(rect)
+    return merged
+
+
+class Layer:
+    def __init__(self, name, kind, draw, section=None, visible=True):
+        self.name = name
+        self.kind = kind
+        self.draw = draw  # draw(surface) -> rect, list of rects or None
+        self.section = section  # Profiler section charged after this layer
+        self.visible = visible
+
+
+class _StaticRun:
+    """Consecutive static layers flattened into one set of sprites."""
+
+    def __init__(self, layers):
+        self.layers = layers
+        self.sprites = None  # [(cropped sprite, screen rect)], None until baked
+
+    def render(self, surface):
+        rects = []
+        for layer in self.layers:
+            if layer.visible:
+                rects.extend(_rect_list(layer.draw(surface)))
+        return rects
+
+    def bake(self, size):
+        canvas = pygame.Surface(size, pygame.SRCALPHA)
+        bounds = canvas.get_rect()
+        rects = [r.clip(bounds) for r in self.render(canvas)]
+        self.sprites = [(canvas.subsurface(r).copy(), r) for r in _merge_overlapping([r for r in rects if r])]
+
+    def blit(self, screen):
+        if self.sprites is None:
+            self.bake(screen.get_size())
+        return [screen.blit(sprite, rect) for sprite, rect in self.sprites]
+
+
+class Compositor:
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.screen = renderer.screen
+        self.layers = []
+        self._stack = None  # Layers and static runs above the background, built on first draw
+        self._background = None
+
+    def add(self, name, kind, draw, section=None, visible=True):
+        """Push a layer on top of the stack."""
+        self.layers.append(Layer(name, kind, draw, section, visible))
+        self._stack = None
+
+    def layer(self, name):
+        return next(layer for layer in self.layers if layer.name == name)
+
+    def set_visible(self, name, visible):
+        layer = self.layer(name)
+        if layer.visible != visible:
+            layer.visible = visible
+            self.invalidate(name)
+
+    def invalidate(self, name=None):
+        """Rebuild the cached surface holding static layer `name`, or every one, on the next draw."""
+        if name is None or self.layer(name).kind == STATIC:
+            self._stack = None
+        self.renderer.invalidate()
+
+    def _build(self):
+        self._stack = []
+        for layer in self.layers:
+            if layer.kind != STATIC:
+                self._stack.append(layer)
+            elif self._stack and isinstance(self._stack[-1], _StaticRun):
+                self._stack[-1].layers.append(layer)
+            else:
+                self._stack.append(_StaticRun([layer]))
+
+        # The bottom of the stack is the background: cached when static, redrawn when animated
+        self._background = None
+        if self._stack and isinstance(self._stack[0], _StaticRun):
+            self._background = self._stack.pop(0).render
+            self.renderer.set_background(self._background, animated=False)
+        elif self._stack and self._stack[0].kind == ANIMATED:
+            self._background = self._stack.pop(0).draw
+            self.renderer.set_background(self._background, animated=True)
+        else:
+            self.renderer.set_background(None)
+
+    def draw(self, mark=None):
+        """Draw every visible layer and report what changed to the renderer."""
+        if self._stack is None:
+            self._build()
+
+        renderer = self.renderer
+        if self._background is not None:
+            renderer.draw_background(self._background)
+            if mark and self.layers[0].section:
+                mark(self.layers[0].section)
+
+        for item in self._stack:
+            if isinstance(item, _StaticRun):
+                renderer.add(*item.blit(self.screen))
+                continue
+            if not item.visible:
+                continue
+            renderer.add(*_rect_list(item.draw(self.screen)))
+            if item.kind == ANIMATED:
+                renderer.invalidate()
+            if mark and item.section:
+                mark(item.section)
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class FontRegistry:
+    """Font faces keyed by (path, size), loaded on first use.
+
+    Opening a font parses the file from disk, so faces are kept and shared.
+    The least recently used faces are closed once `capacity` is reached.
+    """
+
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self._fonts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, size):
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            self._fonts.move_to_end(key)
+            return font
+        self.misses += 1
+
+        font = pygame.font.Font(path, size)
+        self._fonts[key] = font
+        if len(self._fonts) > self.capacity:
+            self._fonts.popitem(last=False)
+        return font
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "fonts": len(self._fonts)}
+
+    def clear(self):
+        self._fonts.clear()
+
+
+FONTS = FontRegistry()
+
+
+class LazyFont:
+    """Stands in for a pygame Font and loads the face through FONTS on first use.
+
+    The proxy itself never changes, so caches keyed on the font object keep
+    hitting even if the registry evicts and reloads the face behind it.
+    """
+
+    def __init__(self, path, size, registry=FONTS):
+        self.path = path
+        self.size_px = size
+        self.registry = registry
+
+    @property
+    def font(self):
+        return self.registry.get(self.path, self.size_px)
+
+    def __getattr__(self, name):
+        return getattr(self.font, name)
+
+    def __repr__(self):
+        return f"LazyFont({self.path!r}, {self.size_px})"
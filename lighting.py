@@ -0,0 +1,77 @@
+"""Shared light layer for the spotlight cones of the level backgrounds.
+
+Set FFF_CONE_SPRITES=1 to reuse cached cone renders instead of filling the
+polygons every frame.
+"""
+import math
+import os
+from collections import OrderedDict
+
+import pygame
+
+CONE_SPRITES_ENV = "FFF_CONE_SPRITES"
+
+# Reuse whole cone renders from a cache keyed by quantized angle, length and hue.
+# Off by default: cones move every frame, so it trades exactness for fewer polygon fills.
+USE_CONE_SPRITES = os.environ.get(CONE_SPRITES_ENV, "") not in ("", "0")
+CONE_ANGLE_STEP = math.radians(2)
+CONE_LENGTH_STEP = 16
+CONE_HUE_STEPS = 48
+
+
+def quantize_cone(angle, length, hue):
+    """Snap cone parameters to the sprite table; returns (key, angle, length, hue)."""
+    a = round(angle / CONE_ANGLE_STEP)
+    d = round(length / CONE_LENGTH_STEP)
+    h = round(hue * CONE_HUE_STEPS) % CONE_HUE_STEPS
+    return (a, d, h), a * CONE_ANGLE_STEP, d * CONE_LENGTH_STEP, h / CONE_HUE_STEPS
+
+
+class LightLayer:
+    """A reusable transparent layer that spotlight cones are drawn into.
+
+    Each cone is drawn into the layer, composited onto the target through its
+    bounding box only, then erased again. No surface is allocated per frame,
+    and overlapping cones still blend as if each had its own layer.
+    """
+
+    def __init__(self, sprite_capacity=64):
+        self.surface = None
+        self.sprites = OrderedDict()  # key -> (cropped cone, top-left), least recently used first
+        self.sprite_capacity = sprite_capacity
+
+    def resize(self, size):
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
+            self.sprites.clear()
+
+    def _render(self, polygons):
+        """Draw [(rgba, points), ...] in order; returns the on-layer bounding box."""
+        bounds = None
+        for color, points in polygons:
+            rect = pygame.draw.polygon(self.surface, color, points)
+            bounds = rect if bounds is None else bounds.union(rect)
+        return bounds.clip(self.surface.get_rect())
+
+    def draw_cone(self, target, polygons):
+        self.resize(target.get_size())
+        bounds = self._render(polygons)
+        rect = target.blit(self.surface, bounds.topleft, bounds)
+        self.surface.fill((0, 0, 0, 0), bounds)
+        return rect
+
+    def draw_cached_cone(self, target, key, build_polygons):
+        """Like draw_cone, but reuses the render for `key`; build_polygons() is called on a miss."""
+        self.resize(target.get_size())
+        entry = self.sprites.get(key)
+        if entry is None:
+            bounds = self._render(build_polygons())
+            entry = (self.surface.subsurface(bounds).copy(), bounds.topleft)
+            self.surface.fill((0, 0, 0, 0), bounds)
+            self.sprites[key] = entry
+            if len(self.sprites) > self.sprite_capacity:
+                self.sprites.popitem(last=False)
+        else:
+            self.sprites.move_to_end(key)
+        sprite, position = entry
+        return target.blit(sprite, position)
@@ -0,0 +1,124 @@
+"""Particle effects for the menus and levels."""
+import math
+import random
+
+import numpy as np
+import pygame
+
+PARTICLE_GRAVITY = 0.1
+PARTICLE_ALPHA_STEP = 17  # Alpha is drawn in 16 buckets so circle sprites can be shared
+
+# (r, g, b, size, alpha bucket) -> pre-rendered circle, shared by every ParticleSystem
+_particle_sprites = {}
+
+
+def particle_sprite(rgb, size, bucket):
+    key = (*rgb, size, bucket)
+    sprite = _particle_sprites.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*rgb, bucket * PARTICLE_ALPHA_STEP), (size, size), size)
+        _particle_sprites[key] = sprite
+    return sprite
+
+
+class ParticleSystem:
+    """Particles kept as parallel NumPy arrays and integrated in one vectorized step.
+
+    Drawing blits cached circle sprites with a single screen.blits call instead
+    of building a new surface per particle.
+    """
+
+    def __init__(self, capacity=256):
+        # Seeded from `random` so a seeded level (e.g. a replay) gets the same effects
+        self.rng = np.random.default_rng(random.getrandbits(32))
+        self.count = 0
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.max_life = np.ones(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.alpha = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)  # Index into self.palette
+        self.palette = []
+        self.palette_index = {}
+
+    def __len__(self):
+        return self.count
+
+    def _reserve(self, extra):
+        needed = self.count + extra
+        capacity = len(self.life)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("position", "velocity", "life", "max_life", "size", "alpha", "color"):
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def _emit(self, x, y, color, velocity, life, size):
+        rgb = tuple(color[:3])
+        if rgb not in self.palette_index:
+            self.palette_index[rgb] = len(self.palette)
+            self.palette.append(rgb)
+
+        n = len(life)
+        self._reserve(n)
+        new = slice(self.count, self.count + n)
+        self.position[new] = (x, y)
+        self.velocity[new] = velocity
+        self.life[new] = life
+        self.max_life[new] = life
+        self.size[new] = size
+        self.alpha[new] = color[3] if len(color) > 3 else 255
+        self.color[new] = self.palette_index[rgb]
+        self.count += n
+
+    def add_explosion(self, x, y, color, count=15):
+        angle = self.rng.uniform(0, 2 * math.pi, count)
+        speed = self.rng.uniform(2, 8, count)
+        velocity = np.column_stack((np.cos(angle) * speed, np.sin(angle) * speed))
+        self._emit(x, y, color, velocity, self.rng.integers(30, 61, count), self.rng.integers(2, 6, count))
+
+    def add_trail(self, x, y, color, count=5):
+        velocity = np.column_stack((self.rng.uniform(-1, 1, count), self.rng.uniform(-3, -1, count)))
+        self._emit(x, y, color, velocity, self.rng.integers(20, 41, count), self.rng.integers(1, 4, count))
+
+    def update(self):
+        # Cull dead particles by compacting the live ones to the front
+        n = self.count
+        alive = np.flatnonzero(self.life[:n] > 0)
+        if len(alive) < n:
+            for array in (self.position, self.velocity, self.life, self.max_life, self.size, self.alpha, self.color):
+                array[:len(alive)] = array[alive]
+            n = self.count = len(alive)
+
+        self.position[:n] += self.velocity[:n]
+        self.velocity[:n, 1] += PARTICLE_GRAVITY
+        self.life[:n] -= 1
+        # Fade out effect
+        self.alpha[:n] = np.maximum(0, 255 * self.life[:n] // self.max_life[:n])
+
+    def draw(self, screen):
+        n = self.count
+        buckets = (self.alpha[:n] + PARTICLE_ALPHA_STEP // 2) // PARTICLE_ALPHA_STEP
+        visible = np.flatnonzero((self.life[:n] > 0) & (buckets > 0))
+        if not len(visible):
+            return None
+
+        size = self.size[visible]
+        corner = (self.position[visible] - size[:, None]).astype(np.int32)
+        palette = self.palette
+        screen.blits(
+            [(particle_sprite(palette[c], s, b), (x, y))
+             for c, s, b, (x, y) in zip(self.color[visible].tolist(), size.tolist(),
+                                        buckets[visible].tolist(), corner.tolist())],
+            doreturn=False)
+
+        # One rect around everything drawn, for dirty-rect presentation
+        left, top = corner.min(axis=0).tolist()
+        right, bottom = (corner + 2 * size[:, None]).max(axis=0).tolist()
+        return pygame.Rect(left, top, right - left, bottom - top)
@@ -0,0 +1,144 @@
+"""Per-section frame timing.
+
+Set FFF_PROFILE=1 to time each phase of the game loop. The loop calls
+begin_frame(), then mark(name) after each phase, then end_frame(); a mark
+charges the time since the previous mark to `name`. The last `capacity`
+frames are kept in a ring buffer, percentiles are written to profiles/ when a
+level ends, and F3 toggles an on-screen graph. When disabled, every call is a
+no-op.
+"""
+import json
+import os
+import time
+
+import numpy as np
+import pygame
+
+PROFILE_ENV = "FFF_PROFILE"
+PROFILE_FOLDER = "profiles"
+FRAME_BUDGET_MS = 1000 / 60
+
+GRAPH_COLORS = [
+    (0, 255, 255), (255, 0, 255), (255, 255, 0), (0, 255, 0),
+    (255, 128, 0), (0, 128, 255), (255, 0, 0), (160, 160, 160),
+]
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+class FrameProfiler:
+    def __init__(self, enabled=None, capacity=600, timer=time.perf_counter):
+        if enabled is None:
+            enabled = os.environ.get(PROFILE_ENV, "") not in ("", "0")
+        self.enabled = enabled
+        self.capacity = capacity
+        self.timer = timer
+        self.sections = {}  # name -> ring buffer of milliseconds, in first-seen order
+        self.frame_times = np.zeros(capacity)
+        self.frame_count = 0
+        self.show_graph = False
+        self._current = {}
+        self._last = self._frame_start = 0.0
+        self._font = None
+
+        if not enabled:
+            # Shadow the methods so a disabled profiler costs one attribute lookup per call
+            self.begin_frame = self.mark = self.end_frame = self.draw_graph = _noop
+
+    def begin_frame(self):
+        self._current = {}
+        self._last = self._frame_start = self.timer()
+
+    def mark(self, name):
+        """Charge the time since the previous mark (or begin_frame) to `name`."""
+        now = self.timer()
+        self._current[name] = self._current.get(name, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+        slot = self.frame_count % self.capacity
+        for name in self._current:
+            if name not in self.sections:
+                self.sections[name] = np.zeros(self.capacity)
+        for name, times in self.sections.items():
+            times[slot] = self._current.get(name, 0.0)
+        self.frame_times[slot] = (self._last - self._frame_start) * 1000
+        self.frame_count += 1
+
+    def _recent(self, times):
+        """The buffered frames, oldest first."""
+        if self.frame_count <= self.capacity:
+            return times[:self.frame_count]
+        slot = self.frame_count % self.capacity
+        return np.concatenate((times[slot:], times[:slot]))
+
+    def percentiles(self):
+        """p50/p95/p99/max/mean in milliseconds for every section and the whole frame."""
+        report = {}
+        for name, times in [("frame", self.frame_times), *self.sections.items()]:
+            recent = self._recent(times)
+            if not len(recent):
+                continue
+            p50, p95, p99 = np.percentile(recent, [50, 95, 99])
+            report[name] = {
+                "p50": round(float(p50), 3),
+                "p95": round(float(p95), 3),
+                "p99": round(float(p99), 3),
+                "max": round(float(recent.max()), 3),
+                "mean": round(float(recent.mean()), 3),
+            }
+        return report
+
+    def export(self, path=None, **info):
+        """Write the percentiles (plus any `info` fields) as JSON; returns the path."""
+        if not self.enabled or not self.frame_count:
+            return None
+        if path is None:
+            os.makedirs(PROFILE_FOLDER, exist_ok=True)
+            path = os.path.join(PROFILE_FOLDER, f"profile_{time.strftime('%Y%m%d-%H%M%S')}.json")
+        report = {**info, "frames": min(self.frame_count, self.capacity), "sections": self.percentiles()}
+        try:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=4)
+        except Exception as e:
+            print(f"Error saving profile: {e}")
+            return None
+        return path
+
+    def toggle_graph(self):
+        self.show_graph = self.enabled and not self.show_graph
+
+    def draw_graph(self, screen, x=20, y=None, frames=180, height=120, ms_range=33.3):
+        """Stacked per-section bars for the last `frames` frames, with the 60 FPS budget line."""
+        if not self.show_graph:
+            return
+        if y is None:
+            y = screen.get_height() - height - 60
+        shown = min(frames, self.frame_count, self.capacity)
+        scale = height / ms_range
+
+        panel = pygame.Rect(x, y, frames * 2, height)
+        pygame.draw.rect(screen, (0, 0, 0), panel)
+        recent = {name: self._recent(times)[-shown:] for name, times in self.sections.items()}
+        for i in range(shown):
+            bar_x = x + (frames - shown + i) * 2
+            bottom = y + height
+            for color_index, times in enumerate(recent.values()):
+                bar = min(int(times[i] * scale), bottom - y)
+                if bar > 0:
+                    color = GRAPH_COLORS[color_index % len(GRAPH_COLORS)]
+                    pygame.draw.rect(screen, color, (bar_x, bottom - bar, 2, bar))
+                    bottom -= bar
+
+        budget_y = y + height - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(screen, (255, 255, 255), (x, budget_y), (panel.right, budget_y), 1)
+
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+        report = self.percentiles()
+        for color_index, name in enumerate(self.sections):
+            color = GRAPH_COLORS[color_index % len(GRAPH_COLORS)]
+            label = self._font.render(f"{name} p95 {report[name]['p95']:.1f} ms", True, color)
+            screen.blit(label, (panel.right + 8, y + color_index * 16))
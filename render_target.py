@@ -0,0 +1,60 @@
+"""Internal render resolution.
+
+The game draws into a canvas of a fixed internal size rather than straight
+into the fullscreen window, and present() scales the canvas to the window in
+one pass. Fill-heavy effects (spotlights, dim overlays, tints, shake buffers)
+then cost the same on a 4K display as on a 1080p one, and layout constants
+are pixels of the canvas whatever the display.
+
+The canvas is FFF_RENDER_HEIGHT rows (default 1080), capped at the display's
+height, at the display's aspect ratio. When it matches the display, the
+window itself is the canvas and nothing is scaled.
+"""
+import os
+
+import pygame
+
+RENDER_HEIGHT_ENV = "FFF_RENDER_HEIGHT"
+DEFAULT_RENDER_HEIGHT = 1080
+
+
+def render_size(display_size, height=None):
+    """The canvas size for a display: `height` rows (or the capped default) at the display's aspect ratio."""
+    display_width, display_height = display_size
+    if height is None:
+        height = min(int(os.environ.get(RENDER_HEIGHT_ENV, 0)) or DEFAULT_RENDER_HEIGHT, display_height)
+    return round(display_width * height / display_height), height
+
+
+class RenderTarget:
+    def __init__(self):
+        self.window = None
+        self.canvas = None
+
+    @property
+    def scaled(self):
+        """True when the canvas is scaled to the window, rather than being the window."""
+        return self.canvas is not None and self.canvas is not self.window
+
+    def open(self, size, flags=pygame.FULLSCREEN):
+        """Open the fullscreen window and return the canvas to draw into."""
+        self.window = pygame.display.set_mode((0, 0), flags)
+        if size == self.window.get_size():
+            self.canvas = self.window
+        else:
+            self.canvas = pygame.Surface(size).convert()
+        return self.canvas
+
+    def present(self, rects=None):
+        """Show the frame: update `rects` of an unscaled window, or flip the whole scaled canvas."""
+        if self.scaled:
+            # Nearest-neighbour scaling into the window; smoothscale costs about five times as much
+            pygame.transform.scale(self.canvas, self.window.get_size(), self.window)
+            pygame.display.flip()
+        elif rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+
+RENDER_TARGET = RenderTarget()
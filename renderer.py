@@ -0,0 +1,86 @@
+"""Dirty-rectangle presentation for levels with a static background.
+
+A static background is drawn once into a cached surface. Each frame the
+renderer restores that background under whatever was drawn the frame before,
+the level draws its moving parts and reports their rects with add(), and only
+the union of old and new rects is pushed with pygame.display.update(). Levels
+whose background declares itself animated fall back to a full redraw and
+flip. When the canvas is scaled to the display (see render_target.py) the
+whole frame is presented either way, but only the dirty rects are redrawn.
+Set FFF_DIRTY_RECTS=0 to always use full flips.
+"""
+import os
+
+import pygame
+
+from render_target import RENDER_TARGET
+
+DIRTY_RECTS_ENV = "FFF_DIRTY_RECTS"
+
+# Beyond this many rects a single update of their union is cheaper
+MAX_UPDATE_RECTS = 64
+
+
+def is_animated(draw_background):
+    """Backgrounds are treated as animated unless they declare `animated = False`."""
+    return getattr(draw_background, "animated", True)
+
+
+class DirtyRectRenderer:
+    def __init__(self, screen, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get(DIRTY_RECTS_ENV, "1") not in ("", "0")
+        self.screen = screen
+        self.enabled = enabled
+        self.background = None
+        self.previous = []
+        self.current = []
+        self.full_frame = True  # Present this frame with a flip
+        self.redraw = True  # Start the next frame from the whole background
+
+    @property
+    def dirty(self):
+        """True when frames are presented with rect updates rather than a full flip."""
+        return self.background is not None
+
+    def set_background(self, draw_background, animated=None):
+        """Cache a static background, or switch to full redraws for an animated one."""
+        if animated is None:
+            animated = is_animated(draw_background)
+        self.background = None
+        if self.enabled and draw_background is not None and not animated:
+            self.background = pygame.Surface(self.screen.get_size())
+            draw_background(self.background)
+        self.invalidate()
+
+    def invalidate(self):
+        """Redraw and present the whole screen; called mid-frame, the next frame is redrawn too."""
+        self.full_frame = self.redraw = True
+
+    def draw_background(self, draw_background, *args):
+        """Start a frame: erase last frame's rects, or draw the full background."""
+        if self.background is None:
+            draw_background(self.screen, *args)
+        elif self.redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(self.background, rect, rect)
+        self.redraw = False
+
+    def add(self, *rects):
+        """Report screen areas drawn this frame (None entries are ignored)."""
+        for rect in rects:
+            if rect:
+                self.current.append(pygame.Rect(rect))
+
+    def present(self):
+        if self.background is None or self.full_frame:
+            RENDER_TARGET.present()
+        else:
+            rects = self.previous + self.current
+            if len(rects) > MAX_UPDATE_RECTS:
+                rects = [rects[0].unionall(rects[1:])]
+            RENDER_TARGET.present(rects)
+        self.previous, self.current = self.current, []
+        self.full_frame = self.redraw
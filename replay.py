@@ -0,0 +1,132 @@
+"""Record and play back level sessions.
+
+A replay stores the level, the seed shared by the note directions and the
+visual effects, the song length, and every key press stamped with song-clock
+time. Because
+LevelSimulation only depends on those, a replay reproduces the original run
+exactly, whether it is rendered through play_level or run headless:
+
+    python replay.py replays/level2_20250101-120000.json             # watch it
+    python replay.py replays/level2_20250101-120000.json --headless  # re-simulate and verify
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from chart import LANES, LANE_INDEX, load_chart
+from simulation import LEVELS, LevelSimulation
+from song_cache import SONG_CACHE
+
+REPLAY_VERSION = 1
+REPLAY_FOLDER = "replays"
+
+
+class Replay:
+    def __init__(self, level_id, seed, spawn_y=1080, inputs=None, result=None, song_length=None):
+        self.level_id = level_id
+        self.seed = seed
+        self.spawn_y = spawn_y  # Spawn line of the recorded run; it sets how early notes appear
+        # Length the recorded run used; probes can disagree between machines, and it sets when the level is won
+        self.song_length = song_length
+        self.inputs = inputs if inputs is not None else []  # [song_time, lane index] pairs
+        self.result = result  # LevelSimulation.summary() of the recorded run
+
+    def record(self, direction, song_time):
+        self.inputs.append([song_time, LANE_INDEX[direction]])
+
+    def presses(self):
+        """Yield (song_time, direction) in recorded order."""
+        for song_time, lane in self.inputs:
+            yield song_time, LANES[lane]
+
+    def to_dict(self):
+        return {
+            "version": REPLAY_VERSION,
+            "level": self.level_id,
+            "seed": self.seed,
+            "spawn_y": self.spawn_y,
+            "song_length": self.song_length,
+            "inputs": self.inputs,
+            "result": self.result,
+        }
+
+    def save(self, path=None):
+        if path is None:
+            os.makedirs(REPLAY_FOLDER, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(REPLAY_FOLDER, f"level{self.level_id}_{stamp}.json")
+        try:
+            with open(path, 'w') as f:
+                # repr-exact floats keep playback bit-identical
+                json.dump(self.to_dict(), f, separators=(",", ":"))
+        except Exception as e:
+            print(f"Error saving replay: {e}")
+            return None
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")
+        return cls(data["level"], data["seed"], data["spawn_y"], data["inputs"], data.get("result"),
+                   data.get("song_length"))
+
+
+class ReplayPlayer:
+    """Feeds recorded presses to a simulation as the song clock passes them."""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.index = 0
+
+    def presses_until(self, song_time):
+        inputs = self.replay.inputs
+        while self.index < len(inputs) and inputs[self.index][0] <= song_time:
+            press_time, lane = inputs[self.index]
+            self.index += 1
+            yield press_time, LANES[lane]
+
+
+def run_headless(replay):
+    """Re-simulate a replay as fast as possible; returns the summary dict."""
+    level_config = LEVELS[replay.level_id]
+    song_length = replay.song_length
+    if song_length is None:
+        song_length = SONG_CACHE.duration(level_config["song"])
+    sim = LevelSimulation(level_config, load_chart(level_config["beatmap"]), song_length,
+                          seed=replay.seed, spawn_y=replay.spawn_y)
+    for song_time, direction in replay.presses():
+        sim.press(direction, song_time)
+    sim.advance(sim.song_length)
+    return sim.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a recorded level session.")
+    parser.add_argument("replay")
+    parser.add_argument("--headless", action="store_true",
+                        help="re-simulate without a window and compare with the recorded result")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    if args.headless:
+        result = run_headless(replay)
+        print(json.dumps(result))
+        if replay.result is not None:
+            recorded = {key: replay.result[key] for key in result}
+            if recorded != result:
+                print(f"Mismatch with recorded result: {json.dumps(recorded)}")
+                sys.exit(1)
+            print("Replay matches the recorded result.")
+        return
+
+    import Main
+    Main.run_replay(replay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Gameplay rules for a level, independent of rendering and audio.
+
+LevelSimulation owns spawning, judgement, health, score and win/lose. It is
+driven purely by song time, so play_level can step it once per frame while a
+batch run can step it as fast as the CPU allows with no pygame display or
+mixer at all:
+
+    python simulation.py --level 2 --runs 100 --accuracy 0.9
+"""
+import argparse
+import heapq
+import json
+import random
+from collections import deque
+
+import numpy as np
+
+from chart import LANE_INDEX, LANES, ChartCursor, load_chart
+from song_cache import SONG_CACHE
+
+TARGET_Y = 100
+MAX_HEALTH = 300
+INITIAL_HEALTH = 100
+
+# Judgement windows, in pixels from TARGET_Y
+PERFECT_DISTANCE = 17
+GOOD_DISTANCE = 40
+BAD_DISTANCE = 60
+MISS_DISTANCE = 50  # A note this far past the target is missed
+
+# Seconds before the end of the song at which the level counts as won
+WIN_MARGIN = 0.5
+# Seconds of play after the last chart note when the song length is unknown
+UNKNOWN_LENGTH_TAIL = 2.0
+
+# === Level Configuration ===
+LEVELS = {
+    1: {"name": "TUTORIAL", "win_threshold": 2000, "arrow_speed": 5, "note_interval_start": 1.5, "note_interval_min": 0.35, "unlocked": True, "beatmap": "beatmap1.json", "song": "music/eighties.mp3"},
+    2: {"name": "Level 1", "win_threshold": 2000, "arrow_speed": 8, "note_interval_start": 1.5, "note_interval_min": 0.3, "unlocked": True, "beatmap": "beatmap2.json", "song": "music/8-bit-music.mp3"},
+    3: {"name": "Level 2", "win_threshold": 2000, "arrow_speed": 9, "note_interval_start": 1.5, "note_interval_min": 0.3, "unlocked": False, "beatmap": "beatmap3.json", "song": "music/Checker.mp3"},
+    4: {"name": "Level 3", "win_threshold": 2000, "arrow_speed": 10, "note_interval_start": 1.5, "note_interval_min": 0.3, "unlocked": False, "beatmap": "beatmap4.json", "song": "music/Heartache.mp3"}
+}
+
+
+class Note:
+    __slots__ = ("direction", "hit_time", "hit", "missed")
+
+    def __init__(self, direction, hit_time):
+        self.direction = direction
+        self.hit_time = hit_time  # Song time (seconds) at which the note reaches TARGET_Y
+        self.hit = self.missed = False
+
+
+class LevelSimulation:
+    """Spawning, judgement, health, score and win/lose for one run of a level.
+
+    All methods take song time in seconds and work in time order, so the
+    outcome depends only on the seed and the press times, not on how often
+    the simulation is stepped.
+
+    A note spawns spawn_lead seconds before its hit time. When the chart opens
+    sooner than that, the run starts at song time -lead_in instead of
+    shifting or dropping those notes; the caller holds the music back until
+    song time 0, so every note scrolls in from the spawn line on the beat.
+    """
+
+    def __init__(self, level_config, chart, song_length, seed=None, spawn_y=1080):
+        if song_length is None:
+            # The song could not be probed; play until just after the last chart note
+            song_length = (float(chart.times[-1]) if len(chart) else 0.0) + UNKNOWN_LENGTH_TAIL
+        self.song_length = song_length
+        self.note_speed = level_config["arrow_speed"] * 60  # arrow_speed is in pixels per frame at 60 FPS
+        # Seconds a note needs to scroll from the spawn line to the targets
+        self.spawn_lead = (spawn_y - TARGET_Y) / self.note_speed
+        self.miss_delay = MISS_DISTANCE / self.note_speed
+        # Chart notes due sooner than spawn_lead would appear part-way up the
+        # screen, so the level starts this many seconds before the song does
+        first_beat = float(chart.times[0]) if len(chart) else self.spawn_lead
+        self.lead_in = max(0.0, self.spawn_lead - first_beat)
+
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.chart_cursor = ChartCursor(chart.deal_lanes(np.random.default_rng(self.seed)))
+        self.note_interval = level_config["note_interval_start"]
+        self.note_interval_min = level_config["note_interval_min"]
+        self.next_interval_time = self.note_interval
+
+        # Live notes per direction, oldest (closest to the target) first
+        self.lanes = {direction: deque() for direction in LANES}
+        self.time = -self.lead_in  # Song time is negative during the lead-in
+        self.score, self.combo, self.max_combo, self.health = 0, 0, 0, INITIAL_HEALTH
+        self.counts = {"perfect": 0, "good": 0, "bad": 0, "miss": 0}
+        self.game_over = self.game_won = False
+        self.events = []  # (kind, song_time) for the presentation layer
+
+    @property
+    def finished(self):
+        return self.game_over or self.game_won
+
+    def pop_events(self):
+        events, self.events = self.events, []
+        return events
+
+    def advance(self, song_time):
+        """Process every spawn, miss and win/lose condition up to `song_time`."""
+        if self.finished or song_time < self.time:
+            return
+        end_time = self.song_length - WIN_MARGIN
+        step_end = min(song_time, end_time)
+
+        self.spawn_until(step_end)
+        self.expire_until(step_end)
+        if self.game_over:
+            return
+
+        self.time = step_end
+        if song_time >= end_time:
+            self.game_won = True
+            self.events.append(("won", end_time))
+
+    def spawn_until(self, song_time):
+        horizon = song_time + self.spawn_lead
+        times, lanes, _ = self.chart_cursor.take_until(horizon)
+        spawns = [(t, LANES[lane]) for t, lane in zip(times.tolist(), lanes.tolist())]
+
+        # Interval notes are scheduled on their own timeline, independent of frame times
+        while self.next_interval_time <= song_time:
+            direction = self.rng.choice(LANES)
+            spawns.append((self.next_interval_time + self.spawn_lead, direction))
+            self.note_interval = max(self.note_interval_min, self.note_interval * 0.99)
+            self.next_interval_time += self.note_interval
+
+        spawns.sort(key=lambda spawn: spawn[0])
+        for hit_time, direction in spawns:
+            self.lanes[direction].append(Note(direction, hit_time))
+
+    def expire_until(self, song_time):
+        """Miss every note that scrolled past the target, earliest first."""
+        while not self.game_over:
+            lane = min((lane for lane in self.lanes.values() if lane),
+                       key=lambda lane: lane[0].hit_time, default=None)
+            if lane is None or lane[0].hit_time + self.miss_delay >= song_time:
+                return
+            note = lane.popleft()
+            note.missed = True
+            miss_time = note.hit_time + self.miss_delay
+            self.score = max(0, self.score - 50)
+            self.combo = 0
+            self.health = max(0, self.health - 5)
+            self.counts["miss"] += 1
+            self.events.append(("miss", miss_time))
+            if self.health <= 0:
+                self.game_over = True
+                self.time = miss_time
+                self.events.append(("lost", miss_time))
+
+    def press(self, direction, song_time):
+        """Judge a key press against the head of its lane; returns the rating or None."""
+        self.advance(song_time)
+        if self.finished:
+            return None
+
+        lane = self.lanes[direction]
+        # Only the oldest live note in a lane can be in the hit window
+        if not lane:
+            return None
+        distance = abs(lane[0].hit_time - song_time) * self.note_speed
+        if distance < PERFECT_DISTANCE:
+            rating, points, combo_breaks, heal = "perfect", 100, False, 10
+        elif distance < GOOD_DISTANCE:
+            rating, points, combo_breaks, heal = "good", 50, False, 5
+        elif distance < BAD_DISTANCE:
+            rating, points, combo_breaks, heal = "bad", 10, True, 2
+        else:
+            return None
+
+        lane.popleft().hit = True
+        self.score += points
+        self.combo = 0 if combo_breaks else self.combo + 1
+        self.max_combo = max(self.max_combo, self.combo)
+        self.health = min(MAX_HEALTH, self.health + heal)
+        self.counts[rating] += 1
+        self.events.append((rating, song_time))
+        return rating
+
+    def summary(self):
+        return {
+            "seed": self.seed,
+            "outcome": "won" if self.game_won else "lost" if self.game_over else "unfinished",
+            "time": self.time,
+            "score": self.score,
+            "max_combo": self.max_combo,
+            "health": self.health,
+            **self.counts,
+        }
+
+
+class AutoPlayer:
+    """Scripted player for headless runs: presses each note with a timing error.
+
+    Each note gets its press planned as soon as it spawns, in hit-time order
+    and with jitter from the player's own RNG, so the presses depend only on
+    the seeds and not on how often the simulation is stepped.
+    """
+
+    def __init__(self, accuracy=0.9, timing_sd=0.03, seed=None):
+        self.accuracy = accuracy  # Chance of attempting a note at all
+        self.timing_sd = timing_sd  # Standard deviation of press timing, in seconds
+        self.rng = random.Random(seed)
+        self.planned = set()  # Notes already given a press (or skipped)
+        self.pending = []  # Heap of (press_time, plan order, direction)
+
+    def plan(self, sim):
+        """Plan a press for every note that spawned since the last call."""
+        spawned = [note for lane in sim.lanes.values() for note in lane if note not in self.planned]
+        spawned.sort(key=lambda note: (note.hit_time, LANE_INDEX[note.direction]))
+        for note in spawned:
+            self.planned.add(note)
+            if self.rng.random() < self.accuracy:
+                press_time = note.hit_time + self.rng.gauss(0, self.timing_sd)
+                heapq.heappush(self.pending, (press_time, len(self.planned), note.direction))
+
+    def presses_until(self, sim, song_time):
+        """Return (press_time, direction) for planned presses that are due by `song_time`, earliest first."""
+        self.plan(sim)
+        due = []
+        while self.pending and self.pending[0][0] <= song_time:
+            press_time, _, direction = heapq.heappop(self.pending)
+            due.append((press_time, direction))
+        return due
+
+
+def run_headless(level_id, seed=None, player=None, step=1 / 60):
+    """Play a level to the end as fast as possible; returns the summary dict."""
+    level_config = LEVELS[level_id]
+    song_length = SONG_CACHE.duration(level_config["song"])
+    sim = LevelSimulation(level_config, load_chart(level_config["beatmap"]), song_length, seed)
+
+    song_time = sim.time
+    while not sim.finished:
+        song_time += step
+        if player:
+            for press_time, direction in player.presses_until(sim, song_time):
+                sim.press(direction, press_time)
+        sim.advance(song_time)
+    return sim.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run levels headlessly and report the outcome.")
+    parser.add_argument("--level", type=int, default=1, choices=sorted(LEVELS))
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run; later runs count up")
+    parser.add_argument("--accuracy", type=float, default=0.9)
+    parser.add_argument("--timing-sd", type=float, default=0.03)
+    args = parser.parse_args()
+
+    for run in range(args.runs):
+        seed = args.seed + run
+        player = AutoPlayer(args.accuracy, args.timing_sd, seed)
+        print(json.dumps({"level": args.level, **run_headless(args.level, seed, player)}))
+
+
+if __name__ == "__main__":
+    main()
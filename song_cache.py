@@ -0,0 +1,212 @@
+import json
+import os
+import struct
+import wave
+
+SONG_CACHE_FILE = "song_cache.json"
+
+# MPEG audio layer III lookup tables
+_MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],  # MPEG-1
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],      # MPEG-2 / 2.5
+}
+_MP3_SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    2.5: [11025, 12000, 8000],
+}
+
+
+def _skip_id3v2(data):
+    """Offset of the first byte after an ID3v2 tag, if the data starts with one."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _parse_mp3_frame_header(header):
+    """Decode a 4-byte MPEG layer III frame header, or return None if invalid."""
+    if header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version_bits = (header[1] >> 3) & 0x03
+    layer_bits = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    if version_bits == 1 or layer_bits != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    version = {0: 2.5, 2: 2, 3: 1}[version_bits]
+    channel_mode = header[3] >> 6
+    return {
+        "version": version,
+        "bitrate": _MP3_BITRATES[1 if version == 1 else 2][bitrate_index] * 1000,
+        "sample_rate": _MP3_SAMPLE_RATES[version][sample_rate_index],
+        "channels": 1 if channel_mode == 3 else 2,
+        "samples_per_frame": 1152 if version == 1 else 576,
+    }
+
+
+def probe_mp3(path):
+    """Read duration and format from MP3 headers without decoding any audio."""
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        data = f.read(256 * 1024)
+        f.seek(max(0, file_size - 128))
+        has_id3v1 = f.read(3) == b"TAG"
+
+    offset = _skip_id3v2(data)
+    if offset >= len(data):
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(256 * 1024)
+        base, offset = offset, 0
+    else:
+        base = 0
+
+    # Find the first frame sync
+    frame = None
+    while offset + 4 <= len(data):
+        frame = _parse_mp3_frame_header(data[offset:offset + 4])
+        if frame:
+            break
+        offset += 1
+    if not frame:
+        return None
+
+    # A Xing/Info or VBRI header in the first frame gives the exact frame count
+    frame_count = None
+    mono = frame["channels"] == 1
+    if frame["version"] == 1:
+        xing_offset = offset + 4 + (17 if mono else 32)
+    else:
+        xing_offset = offset + 4 + (9 if mono else 17)
+    tag = data[xing_offset:xing_offset + 4]
+    if tag in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing_offset + 4:xing_offset + 8])[0]
+        if flags & 0x1:
+            frame_count = struct.unpack(">I", data[xing_offset + 8:xing_offset + 12])[0]
+    elif data[offset + 36:offset + 40] == b"VBRI":
+        frame_count = struct.unpack(">I", data[offset + 50:offset + 54])[0]
+
+    if frame_count:
+        duration = frame_count * frame["samples_per_frame"] / frame["sample_rate"]
+    else:
+        # Constant bit rate: the audio payload size gives the length
+        audio_bytes = file_size - (base + offset) - (128 if has_id3v1 else 0)
+        duration = audio_bytes * 8 / frame["bitrate"]
+
+    return {
+        "duration": duration,
+        "sample_rate": frame["sample_rate"],
+        "channels": frame["channels"],
+        "bitrate": frame["bitrate"],
+    }
+
+
+def probe_wav(path):
+    with wave.open(path, "rb") as w:
+        return {
+            "duration": w.getnframes() / w.getframerate(),
+            "sample_rate": w.getframerate(),
+            "channels": w.getnchannels(),
+            "bitrate": w.getframerate() * w.getnchannels() * w.getsampwidth() * 8,
+        }
+
+
+def probe_song(path):
+    """Collect song metadata as cheaply as the file format allows; None if nothing can read it."""
+    try:
+        import mutagen
+    except ImportError:
+        mutagen = None
+
+    if mutagen:
+        audio = mutagen.File(path)
+        if audio is not None and audio.info:
+            return {
+                "duration": audio.info.length,
+                "sample_rate": getattr(audio.info, "sample_rate", None),
+                "channels": getattr(audio.info, "channels", None),
+                "bitrate": getattr(audio.info, "bitrate", None),
+            }
+
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == ".mp3":
+            info = probe_mp3(path)
+            if info:
+                return info
+        elif extension == ".wav":
+            return probe_wav(path)
+    except (OSError, EOFError, wave.Error, struct.error) as e:
+        print(f"Warning: Could not read headers of {path}: {e}")
+
+    # Last resort: decode the whole file once; the result is cached on disk
+    import pygame
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()  # Headless callers have not opened the mixer
+        sound = pygame.mixer.Sound(path)
+    except pygame.error as e:
+        print(f"Warning: Could not decode {path}: {e}")
+        return None
+    frequency, _, channels = pygame.mixer.get_init()
+    return {
+        "duration": sound.get_length(),
+        "sample_rate": frequency,
+        "channels": channels,
+        "bitrate": None,
+    }
+
+
+class SongMetadataCache:
+    """Persistent song metadata keyed by file path, invalidated by mtime and size."""
+
+    def __init__(self, cache_file=SONG_CACHE_FILE):
+        self.cache_file = cache_file
+        self.entries = None
+
+    def load(self):
+        try:
+            with open(self.cache_file, 'r') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self):
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump(self.entries, f, indent=4)
+        except Exception as e:
+            print(f"Error saving song cache: {e}")
+
+    def get(self, path):
+        """Return the metadata dict for `path`, probing and persisting it on a miss."""
+        if self.entries is None:
+            self.load()
+
+        key = os.path.normpath(path)
+        stat = os.stat(path)
+        entry = self.entries.get(key)
+        if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            return entry
+
+        info = probe_song(path)
+        if info is None:
+            # A stale entry beats nothing; an unknown result is not saved, so the next run retries
+            return entry or {"duration": None, "sample_rate": None, "channels": None, "bitrate": None}
+        entry = info
+        entry["mtime"] = stat.st_mtime
+        entry["size"] = stat.st_size
+        self.entries[key] = entry
+        self.save()
+        return entry
+
+    def duration(self, path):
+        """Song length in seconds, or None when the file could not be read."""
+        return self.get(path)["duration"]
+
+
+SONG_CACHE = SongMetadataCache()
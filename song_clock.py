@@ -0,0 +1,74 @@
+import time
+
+import pygame
+
+
+def mixer_position():
+    """Return the streamed music position in seconds, or None when nothing is playing."""
+    pos_ms = pygame.mixer.music.get_pos()
+    if pos_ms < 0:
+        return None
+    return pos_ms / 1000.0
+
+
+class SongClock:
+    """Smooth, high-resolution song position shared by the whole game loop.
+
+    pygame.mixer.music.get_pos() only changes when the mixer hands a new buffer
+    to the audio device, so on its own it moves in coarse steps. The clock
+    extrapolates between those steps with time.perf_counter() and, whenever
+    the mixer reports a new position, pulls its offset part of the way towards
+    it. Small drift between the audio device and the CPU clock is corrected
+    gradually; large jumps (seeks, stalls) snap straight to the mixer. The
+    clock never runs backwards: when it is ahead, it holds until the mixer
+    catches up.
+
+    A negative start position counts down a lead-in before the music: the
+    clock runs on perf_counter alone until it reaches 0.
+    """
+
+    def __init__(self, position_source=mixer_position, timer=time.perf_counter,
+                 drift_gain=0.1, snap_threshold=0.1):
+        self.position_source = position_source  # None makes the clock free-running
+        self.timer = timer
+        self.drift_gain = drift_gain
+        self.snap_threshold = snap_threshold
+
+        self.time = 0.0
+        self.running = False
+        self.synced = False
+        self._offset = 0.0
+        self._last_reported = None
+
+    def start(self, position=0.0):
+        """Start counting from `position` seconds and follow the mixer."""
+        self._offset = position - self.timer()
+        self._last_reported = None
+        self.time = position
+        self.running = True
+        self.synced = self.position_source is not None
+
+    def stop(self):
+        """Stop following the mixer; the clock keeps running on perf_counter."""
+        self.synced = False
+
+    def update(self):
+        """Advance the clock. Call once per frame and use the returned seconds."""
+        if not self.running:
+            return self.time
+
+        predicted = self.timer() + self._offset
+        if self.synced and self.time >= 0:
+            reported = self.position_source()
+            if reported is not None and reported != self._last_reported:
+                self._last_reported = reported
+                error = reported - predicted
+                # Large errors re-base the offset outright, small ones are eased in
+                correction = error if abs(error) > self.snap_threshold else error * self.drift_gain
+                self._offset += correction
+                predicted += correction
+
+        # Never run backwards: a clock that is ahead of the mixer holds until
+        # the mixer catches up, so a forward snap is immediate and a backward one waits
+        self.time = max(self.time, predicted)
+        return self.time
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# Headless SDL, so pygame surfaces and the mixer work without a display or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def song_cache(tmp_path, monkeypatch):
+    """Run from the repo root, where levels find their songs, with SONG_CACHE kept out of the tree."""
+    from song_cache import SONG_CACHE
+
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(SONG_CACHE, "cache_file", str(tmp_path / "song_cache.json"))
+    monkeypatch.setattr(SONG_CACHE, "entries", None)
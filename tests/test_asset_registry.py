@@ -0,0 +1,75 @@
+import pygame
+import pytest
+
+from asset_registry import AssetRegistry, ScaleLadder
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    image = pygame.Surface((20, 10), pygame.SRCALPHA)
+    image.fill((200, 100, 50, 255))
+    path = str(tmp_path / "sprite.png")
+    pygame.image.save(image, path)
+    return path
+
+
+def test_image_is_loaded_once(image_path):
+    registry = AssetRegistry()
+    first = registry.image(image_path)
+    assert registry.image(image_path) is first
+    assert first.get_size() == (20, 10)
+    assert (registry.hits, registry.misses) == (1, 1)
+
+
+def test_variants_are_memoized_from_the_shared_original(image_path):
+    registry = AssetRegistry()
+    scaled = registry.image(image_path, (40, 20))
+    assert scaled.get_size() == (40, 20)
+    assert registry.image(image_path, (40, 20)) is scaled
+    assert registry.scaled_by(image_path, 2) is scaled
+    assert registry.stats()["surfaces"] == 2  # The original and one scaled copy
+
+
+def test_tint_multiplies_a_copy(image_path):
+    registry = AssetRegistry()
+    tinted = registry.image(image_path, tint=(128, 255, 255))
+    assert tinted.get_at((0, 0))[:3] == (100, 100, 50)
+    assert registry.image(image_path).get_at((0, 0))[:3] == (200, 100, 50)
+
+
+def test_stats_report_memory_and_clear_empties(image_path):
+    registry = AssetRegistry()
+    registry.image(image_path)
+    registry.image(image_path, (40, 20))
+    stats = registry.stats()
+    assert stats["memory_bytes"] >= (20 * 10 + 40 * 20) * 4
+    registry.clear()
+    assert registry.stats()["surfaces"] == 0
+    assert registry.stats()["memory_bytes"] == 0
+
+
+def test_scale_ladder_snaps_to_nearest_step():
+    image = pygame.Surface((100, 50))
+    ladder = ScaleLadder(image, 0.5, 2.0, ratio=1.1)
+    assert ladder.get(0.5).get_size() == (50, 25)
+    assert ladder.get(0.1) is ladder.steps[0]
+    assert ladder.get(0.5 * 1.1 ** 3 * 1.01) is ladder.steps[3]
+    assert ladder.get(5.0) is ladder.steps[-1]
+    assert ladder.steps[-1].get_size() == (200, 100)  # The top step is `high` exactly
+
+
+def test_images_cached_before_the_display_are_converted_once_it_opens(image_path):
+    registry = AssetRegistry()
+    pygame.display.quit()
+    early = registry.image(image_path)
+    early_scaled = registry.image(image_path, (40, 20))
+    pygame.display.init()
+    try:
+        pygame.display.set_mode((64, 48))
+        converted = registry.image(image_path)
+        assert converted is not early
+        assert registry.image(image_path) is converted
+        assert registry.image(image_path, (40, 20)) is not early_scaled
+        assert converted.get_at((0, 0)) == early.get_at((0, 0))
+    finally:
+        pygame.display.quit()
@@ -0,0 +1,53 @@
+import numpy as np
+
+from chart import FLAG_RANDOM_LANE, LANE_INDEX, Chart, ChartCursor
+
+BEATMAP = [
+    2.0,
+    {"time": 0.5, "direction": "up"},
+    {"time": 1.0},
+    1.0,
+    {"time": 3.5, "direction": "left"},
+]
+
+
+def test_from_beatmap_sorts_and_flags():
+    chart = Chart.from_beatmap(BEATMAP)
+    assert chart.times.tolist() == [0.5, 1.0, 1.0, 2.0, 3.5]
+    assert chart.lanes.tolist() == [LANE_INDEX["up"], -1, -1, -1, LANE_INDEX["left"]]
+    assert chart.flags.tolist() == [0, FLAG_RANDOM_LANE, FLAG_RANDOM_LANE, FLAG_RANDOM_LANE, 0]
+
+
+def test_deal_lanes_only_fills_random_lanes():
+    chart = Chart.from_beatmap(BEATMAP)
+    dealt = chart.deal_lanes(np.random.default_rng(7))
+    assert (dealt.lanes >= 0).all()
+    assert dealt.lanes[0] == LANE_INDEX["up"] and dealt.lanes[4] == LANE_INDEX["left"]
+    assert (chart.lanes[1:4] == -1).all()  # The compiled chart is left untouched
+    assert dealt.lanes.tolist() == chart.deal_lanes(np.random.default_rng(7)).lanes.tolist()
+
+
+def test_take_until_hands_out_each_note_once():
+    cursor = ChartCursor(Chart.from_beatmap(BEATMAP))
+    assert cursor.take_until(0.4)[0].tolist() == []
+    assert cursor.take_until(1.0)[0].tolist() == [0.5, 1.0, 1.0]
+    assert cursor.take_until(1.0)[0].tolist() == []
+    assert cursor.take_until(0.7)[0].tolist() == []  # Going back in time hands out nothing
+    assert cursor.take_until(10.0)[0].tolist() == [2.0, 3.5]
+    assert cursor.done()
+
+
+def test_seek_restarts_at_first_note_at_or_after_time():
+    cursor = ChartCursor(Chart.from_beatmap(BEATMAP), song_time=1.0)
+    assert cursor.take_until(2.0)[0].tolist() == [1.0, 1.0, 2.0]
+
+    cursor.seek(0.0)
+    assert cursor.take_until(0.5)[0].tolist() == [0.5]
+    cursor.seek(3.0)
+    assert cursor.take_until(10.0)[0].tolist() == [3.5]
+
+
+def test_empty_chart():
+    cursor = ChartCursor(Chart.from_beatmap([]))
+    assert cursor.done()
+    assert len(cursor.take_until(5.0)[0]) == 0
@@ -0,0 +1,75 @@
+import pygame
+
+from compositor import ANIMATED, DYNAMIC, STATIC, Compositor
+from renderer import DirtyRectRenderer
+
+SIZE = (40, 30)
+
+
+class Counter:
+    """A layer draw function that fills a rect and counts its calls."""
+
+    def __init__(self, rect, color):
+        self.rect = pygame.Rect(rect)
+        self.color = color
+        self.calls = 0
+
+    def __call__(self, surface):
+        self.calls += 1
+        return surface.fill(self.color, self.rect)
+
+
+def make_compositor():
+    screen = pygame.Surface(SIZE)
+    layers = {
+        "background": Counter((0, 0, *SIZE), (50, 50, 50)),
+        "sprite": Counter((2, 2, 4, 4), (255, 0, 0)),
+        "label": Counter((10, 10, 8, 4), (0, 255, 0)),
+    }
+    compositor = Compositor(DirtyRectRenderer(screen, enabled=True))
+    compositor.add("background", STATIC, layers["background"])
+    compositor.add("sprite", DYNAMIC, layers["sprite"])
+    compositor.add("label", STATIC, layers["label"])
+    return compositor, screen, layers
+
+
+def test_static_layers_are_drawn_once():
+    compositor, screen, layers = make_compositor()
+    for _ in range(3):
+        compositor.draw()
+    assert layers["background"].calls == 1
+    assert layers["label"].calls == 1
+    assert layers["sprite"].calls == 3
+    assert screen.get_at((12, 11))[:3] == (0, 255, 0)
+
+
+def test_invalidate_rebuilds_only_for_static_layers():
+    compositor, screen, layers = make_compositor()
+    compositor.draw()
+    compositor.invalidate("sprite")
+    compositor.draw()
+    assert layers["label"].calls == 1
+    assert compositor.renderer.full_frame
+
+    compositor.invalidate("label")
+    compositor.draw()
+    assert layers["background"].calls == 2
+    assert layers["label"].calls == 2
+
+
+def test_hiding_a_static_layer_removes_it():
+    compositor, screen, layers = make_compositor()
+    compositor.draw()
+    compositor.set_visible("label", False)
+    compositor.draw()
+    assert screen.get_at((12, 11))[:3] == (50, 50, 50)
+    assert layers["label"].calls == 1
+
+
+def test_animated_layer_forces_full_frames():
+    compositor, screen, layers = make_compositor()
+    compositor.add("overlay", ANIMATED, Counter((0, 0, *SIZE), (0, 0, 0)), visible=False)
+    compositor.draw()
+    compositor.set_visible("overlay", True)
+    compositor.draw()
+    assert compositor.renderer.full_frame and compositor.renderer.redraw
@@ -0,0 +1,29 @@
+import pygame
+import pytest
+
+from font_registry import FontRegistry, LazyFont
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fonts():
+    pygame.font.init()
+    yield
+    pygame.font.quit()
+
+
+def test_font_registry_shares_faces_and_evicts_least_recently_used():
+    registry = FontRegistry(capacity=2)
+    small = registry.get(None, 10)
+    registry.get(None, 12)
+    assert registry.get(None, 10) is small
+    registry.get(None, 14)  # Evicts size 12
+    assert registry.stats() == {"hits": 1, "misses": 3, "fonts": 2}
+    assert registry.get(None, 10) is small
+
+
+def test_lazy_font_loads_on_first_use():
+    registry = FontRegistry()
+    font = LazyFont(None, 16, registry)
+    assert registry.stats()["misses"] == 0
+    assert font.get_height() == registry.get(None, 16).get_height()
+    assert registry.stats()["fonts"] == 1
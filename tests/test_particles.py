@@ -0,0 +1,49 @@
+import random
+
+import pygame
+
+from particles import ParticleSystem
+
+
+def make_system(capacity=4):
+    random.seed(3)
+    return ParticleSystem(capacity)
+
+
+def test_emitters_add_particles_and_grow_the_arrays():
+    particles = make_system()
+    particles.add_explosion(50, 50, (255, 0, 0), count=10)
+    particles.add_trail(20, 20, (0, 255, 0, 128), count=5)
+    assert len(particles) == 15
+    assert len(particles.life) >= 15
+    assert particles.palette == [(255, 0, 0), (0, 255, 0)]
+    assert (particles.alpha[10:15] == 128).all()
+
+
+def test_update_moves_fades_and_culls():
+    particles = make_system()
+    particles.add_trail(20, 20, (0, 0, 255), count=5)
+    start = particles.position[:5].copy()
+    particles.update()
+    assert (particles.position[:5] != start).any()
+    assert (particles.alpha[:5] < 255).all()
+    for _ in range(41):  # Trails live at most 40 frames
+        particles.update()
+    assert len(particles) == 0
+
+
+def test_same_seed_gives_same_particles():
+    a, b = make_system(), make_system()
+    for particles in (a, b):
+        particles.add_explosion(0, 0, (255, 255, 255))
+        particles.update()
+    assert (a.position[:len(a)] == b.position[:len(b)]).all()
+
+
+def test_draw_blits_live_particles():
+    particles = make_system()
+    particles.add_explosion(30, 30, (255, 0, 0), count=20)
+    screen = pygame.Surface((60, 60))
+    particles.draw(screen)
+    assert screen.get_at((30, 30))[0] > 0
+    assert make_system().draw(pygame.Surface((10, 10))) is None
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from profiler import FrameProfiler
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def play_frames(profiler, timer, frames):
+    """Each frame spends 2 ms in "update" and `i` ms in "draw"."""
+    for i in range(frames):
+        profiler.begin_frame()
+        timer.now += 0.002
+        profiler.mark("update")
+        timer.now += i / 1000
+        profiler.mark("draw")
+        profiler.end_frame()
+
+
+def test_marks_charge_time_to_sections():
+    timer = FakeTimer()
+    profiler = FrameProfiler(enabled=True, timer=timer)
+    play_frames(profiler, timer, 11)
+    report = profiler.percentiles()
+    assert list(report) == ["frame", "update", "draw"]
+    assert report["update"]["p50"] == pytest.approx(2.0)
+    assert report["draw"]["max"] == pytest.approx(10.0)
+    assert report["draw"]["p50"] == pytest.approx(5.0)
+    assert report["frame"]["mean"] == pytest.approx(7.0)
+
+
+def test_ring_buffer_keeps_the_last_frames():
+    timer = FakeTimer()
+    profiler = FrameProfiler(enabled=True, capacity=4, timer=timer)
+    play_frames(profiler, timer, 10)
+    report = profiler.percentiles()
+    assert report["draw"]["p50"] == pytest.approx(7.5)  # Frames 6..9
+    assert report["draw"]["max"] == pytest.approx(9.0)
+
+
+def test_export_writes_percentiles(tmp_path):
+    timer = FakeTimer()
+    profiler = FrameProfiler(enabled=True, timer=timer)
+    play_frames(profiler, timer, 3)
+    path = profiler.export(str(tmp_path / "profile.json"), level=2)
+    with open(path) as f:
+        data = json.load(f)
+    assert data["level"] == 2
+    assert data["frames"] == 3
+    assert set(data["sections"]) == {"frame", "update", "draw"}
+
+
+def test_disabled_profiler_records_nothing(monkeypatch, tmp_path):
+    monkeypatch.delenv("FFF_PROFILE", raising=False)
+    profiler = FrameProfiler()
+    assert not profiler.enabled
+    profiler.begin_frame()
+    profiler.mark("update")
+    profiler.end_frame()
+    assert profiler.frame_count == 0
+    assert profiler.export(str(tmp_path / "profile.json")) is None
@@ -0,0 +1,44 @@
+import pygame
+import pytest
+
+from render_target import RenderTarget, render_size
+
+
+@pytest.fixture(autouse=True)
+def no_height_override(monkeypatch):
+    monkeypatch.delenv("FFF_RENDER_HEIGHT", raising=False)
+
+
+@pytest.mark.parametrize("display, canvas", [
+    ((3840, 2160), (1920, 1080)),  # 4K renders at 1080p
+    ((2560, 1080), (2560, 1080)),  # Ultrawide keeps its aspect ratio
+    ((1280, 720), (1280, 720)),    # Never taller than the display
+    ((1024, 768), (1024, 768)),
+])
+def test_render_size_defaults_to_1080_rows(display, canvas):
+    assert render_size(display) == canvas
+
+
+def test_render_size_height_argument_and_override(monkeypatch):
+    assert render_size((3840, 2160), 720) == (1280, 720)
+    monkeypatch.setenv("FFF_RENDER_HEIGHT", "540")
+    assert render_size((3840, 2160)) == (960, 540)
+    monkeypatch.setenv("FFF_RENDER_HEIGHT", "2000")
+    assert render_size((1920, 1080)) == (1920, 1080)  # The override is capped too
+
+
+def test_canvas_is_the_window_when_sizes_match():
+    target = RenderTarget()
+    pygame.display.init()
+    window_size = pygame.display.get_desktop_sizes()[0]  # What a (0, 0) window opens at
+    try:
+        assert target.open(window_size, flags=0) is target.window
+        assert not target.scaled
+
+        canvas = target.open((32, 24), flags=0)
+        assert target.scaled
+        canvas.fill((255, 0, 0))
+        target.present()
+        assert target.window.get_at((window_size[0] - 1, window_size[1] - 1))[:3] == (255, 0, 0)
+    finally:
+        pygame.display.quit()
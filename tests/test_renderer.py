@@ -0,0 +1,61 @@
+import pygame
+import pytest
+
+import renderer
+from renderer import DirtyRectRenderer
+
+SIZE = (64, 48)
+
+
+class RecordingTarget:
+    """Stands in for RENDER_TARGET and keeps what the display would show."""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.shown = pygame.Surface(SIZE)
+
+    def present(self, rects=None):
+        for rect in [self.canvas.get_rect()] if rects is None else rects:
+            self.shown.blit(self.canvas, rect, rect)
+
+
+def draw_background(surface):
+    surface.fill((90, 90, 90))
+    pygame.draw.rect(surface, (200, 40, 40), (8, 8, 20, 12))
+
+draw_background.animated = False
+
+
+def run_frames(monkeypatch, dirty, frames=12, overlay_from=4):
+    """Play a sprite moving over a static background, dimmed from `overlay_from` on."""
+    screen = pygame.Surface(SIZE)
+    target = RecordingTarget(screen)
+    monkeypatch.setattr(renderer, "RENDER_TARGET", target)
+    dim = pygame.Surface(SIZE, pygame.SRCALPHA)
+    dim.fill((0, 0, 0, 120))
+
+    frames_shown = []
+    r = DirtyRectRenderer(screen, enabled=dirty)
+    r.set_background(draw_background)
+    for frame in range(frames):
+        r.draw_background(draw_background)
+        r.add(screen.fill((240, 240, 0), (frame * 4, 30, 6, 6)))
+        if frame >= overlay_from:
+            # Like the end screen: a full-screen overlay drawn over the frame
+            screen.blit(dim, (0, 0))
+            r.invalidate()
+        r.present()
+        frames_shown.append(pygame.image.tobytes(target.shown, "RGB"))
+    return frames_shown
+
+
+@pytest.mark.parametrize("overlay_from", [0, 4])
+def test_dirty_rects_match_full_flips_under_overlay(monkeypatch, overlay_from):
+    dirty = run_frames(monkeypatch, True, overlay_from=overlay_from)
+    full = run_frames(monkeypatch, False, overlay_from=overlay_from)
+    for frame, (a, b) in enumerate(zip(dirty, full)):
+        assert a == b, f"frame {frame} differs"
+
+
+def test_dirty_rects_match_full_flips_without_overlay(monkeypatch):
+    assert run_frames(monkeypatch, True, overlay_from=99) == run_frames(monkeypatch, False, overlay_from=99)
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from chart import load_chart
+from replay import REPLAY_VERSION, Replay, ReplayPlayer, run_headless
+from simulation import LEVELS, AutoPlayer, LevelSimulation
+from song_cache import SONG_CACHE
+
+
+def record_run(level_id, seed, step=1 / 60):
+    """Play a level with an AutoPlayer the way play_level does, recording every press."""
+    level_config = LEVELS[level_id]
+    replay = Replay(level_id, seed, spawn_y=900)
+    sim = LevelSimulation(level_config, load_chart(level_config["beatmap"]),
+                          SONG_CACHE.duration(level_config["song"]), seed=replay.seed, spawn_y=replay.spawn_y)
+    player = AutoPlayer(0.8, 0.04, seed)
+    song_time = sim.time
+    while not sim.finished:
+        song_time += step
+        for press_time, direction in player.presses_until(sim, song_time):
+            replay.record(direction, press_time)
+            sim.press(direction, press_time)
+        sim.advance(song_time)
+    replay.song_length = sim.song_length
+    replay.result = sim.summary()
+    return replay
+
+
+@pytest.mark.parametrize("level_id, seed", [(1, 4), (4, 9)])
+def test_saved_replay_reproduces_the_run(song_cache, tmp_path, level_id, seed):
+    replay = record_run(level_id, seed)
+    assert replay.inputs
+
+    path = replay.save(str(tmp_path / "run.json"))
+    loaded = Replay.load(path)
+    assert (loaded.level_id, loaded.seed, loaded.spawn_y) == (level_id, seed, 900)
+    assert loaded.inputs == replay.inputs  # Floats survive the JSON round trip exactly
+    assert loaded.song_length == replay.song_length
+    assert run_headless(loaded) == replay.result
+
+
+def test_replay_uses_its_own_song_length(song_cache, monkeypatch):
+    replay = record_run(1, 4)
+    # Another machine probes the song differently; the replay must still end where it did
+    monkeypatch.setattr(SONG_CACHE, "duration", lambda path: replay.song_length + 5.0)
+    assert run_headless(replay) == replay.result
+
+
+def test_replay_player_hands_out_presses_in_order():
+    replay = Replay(1, 0)
+    for song_time, direction in [(0.5, "left"), (1.0, "up"), (1.0, "down"), (2.5, "right")]:
+        replay.record(direction, song_time)
+    player = ReplayPlayer(replay)
+    assert list(player.presses_until(0.4)) == []
+    assert list(player.presses_until(1.0)) == [(0.5, "left"), (1.0, "up"), (1.0, "down")]
+    assert list(player.presses_until(3.0)) == [(2.5, "right")]
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / "old.json"
+    data = Replay(1, 0).to_dict()
+    data["version"] = REPLAY_VERSION + 1
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError):
+        Replay.load(str(path))
@@ -0,0 +1,107 @@
+import pytest
+
+from chart import Chart
+from simulation import (INITIAL_HEALTH, UNKNOWN_LENGTH_TAIL, AutoPlayer, LevelSimulation,
+                        run_headless)
+
+# 300 px/s with the spawn line 300 px below the targets: notes spawn 1 s early.
+# The interval timeline is pushed out of the way so only chart notes appear.
+LEVEL = {"arrow_speed": 5, "note_interval_start": 1000.0, "note_interval_min": 1000.0}
+SPAWN_Y = 400
+
+BEATMAP = [
+    {"time": 1.0, "direction": "left"},
+    {"time": 2.0, "direction": "left"},
+    {"time": 3.0, "direction": "up"},
+]
+
+
+def make_sim(beatmap=BEATMAP, song_length=10.0):
+    return LevelSimulation(LEVEL, Chart.from_beatmap(beatmap), song_length, seed=1, spawn_y=SPAWN_Y)
+
+
+@pytest.mark.parametrize("offset, rating, points, heal", [
+    (0.0, "perfect", 100, 10),
+    (0.1, "good", 50, 5),       # 30 px late
+    (-0.15, "bad", 10, 2),      # 45 px early
+])
+def test_press_is_judged_by_distance(offset, rating, points, heal):
+    sim = make_sim()
+    assert sim.press("left", 1.0 + offset) == rating
+    assert sim.score == points
+    assert sim.health == INITIAL_HEALTH + heal
+    assert sim.counts[rating] == 1
+    assert sim.combo == (0 if rating == "bad" else 1)
+    assert (rating, 1.0 + offset) in sim.pop_events()
+
+
+def test_press_outside_window_or_on_empty_lane_is_ignored():
+    sim = make_sim()
+    assert sim.press("left", 0.5) is None  # 150 px early
+    assert sim.press("down", 1.0) is None
+    assert sim.lanes["left"][0].hit_time == 1.0
+    assert sim.score == 0
+
+
+def test_press_only_judges_the_lane_head():
+    sim = make_sim([{"time": 1.0, "direction": "left"}, {"time": 1.1, "direction": "left"}])
+    assert sim.press("left", 1.1) == "good"  # Judged against the 1.0 s note, not the perfect 1.1 s one
+    assert [note.hit_time for note in sim.lanes["left"]] == [1.1]
+
+
+def test_notes_past_the_target_are_missed_in_time_order():
+    sim = make_sim()
+    assert sim.press("left", 1.0) == "perfect"
+    sim.advance(3.5)
+    events = sim.pop_events()
+    assert [kind for kind, _ in events] == ["perfect", "miss", "miss"]
+    assert events[1][1] == pytest.approx(2.0 + sim.miss_delay)
+    assert events[2][1] == pytest.approx(3.0 + sim.miss_delay)
+    assert sim.counts["miss"] == 2
+    assert sim.combo == 0
+    assert sim.health == INITIAL_HEALTH + 10 - 2 * 5
+
+
+def test_running_out_of_health_loses_at_the_miss():
+    beatmap = [{"time": 1.0 + i * 0.1, "direction": "right"} for i in range(INITIAL_HEALTH // 5)]
+    sim = make_sim(beatmap)
+    sim.advance(10.0)
+    assert sim.game_over and not sim.game_won
+    assert sim.time == pytest.approx(beatmap[-1]["time"] + sim.miss_delay)
+    assert sim.summary()["outcome"] == "lost"
+
+
+def test_level_is_won_at_the_end_of_the_song():
+    sim = make_sim(song_length=4.0)
+    for note in BEATMAP:
+        sim.press(note["direction"], note["time"])
+    sim.advance(4.0)
+    assert sim.game_won
+    assert sim.summary()["outcome"] == "won"
+    assert sim.press("up", 4.0) is None
+
+
+def test_unknown_song_length_ends_after_the_last_note():
+    sim = make_sim(song_length=None)
+    assert sim.song_length == pytest.approx(3.0 + UNKNOWN_LENGTH_TAIL)
+
+
+def test_early_chart_notes_get_a_lead_in():
+    sim = make_sim([{"time": 0.25, "direction": "down"}])
+    assert sim.lead_in == pytest.approx(0.75)
+    assert sim.time == pytest.approx(-0.75)
+    sim.advance(-0.75)
+    assert [note.hit_time for note in sim.lanes["down"]] == [0.25]  # Spawned on the spawn line
+    assert make_sim().lead_in == 0.0
+
+
+@pytest.mark.parametrize("level_id, seed", [(1, 2), (3, 5)])
+def test_headless_runs_do_not_depend_on_the_step(song_cache, level_id, seed):
+    results = [run_headless(level_id, seed, AutoPlayer(0.8, 0.04, seed), step=step)
+               for step in (1 / 60, 1 / 13, 1 / 240)]
+    assert results[0] == results[1] == results[2]
+    assert results[0]["perfect"] > 0
+
+
+def test_headless_runs_repeat_for_a_seed(song_cache):
+    assert run_headless(2, 3, AutoPlayer(seed=3)) == run_headless(2, 3, AutoPlayer(seed=3))
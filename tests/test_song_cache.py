@@ -0,0 +1,106 @@
+import struct
+import wave
+
+import pytest
+
+import song_cache
+from song_cache import SongMetadataCache, probe_mp3, probe_wav
+
+# MPEG-1 layer III, 128 kbit/s, 44.1 kHz, joint stereo, no padding: 417-byte frames
+FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+FRAME_BYTES = 144 * 128000 // 44100
+
+
+def write_mp3(path, frames, prefix=b"", xing_frames=None):
+    first = bytearray(FRAME_HEADER + bytes(FRAME_BYTES - 4))
+    if xing_frames is not None:
+        first[4 + 32:4 + 32 + 12] = b"Xing" + struct.pack(">II", 0x1, xing_frames)
+    body = bytes(first) + (FRAME_HEADER + bytes(FRAME_BYTES - 4)) * (frames - 1)
+    path.write_bytes(prefix + body)
+    return str(path)
+
+
+def test_probe_mp3_cbr_length_from_payload(tmp_path):
+    info = probe_mp3(write_mp3(tmp_path / "cbr.mp3", 200))
+    assert info["sample_rate"] == 44100
+    assert info["channels"] == 2
+    assert info["bitrate"] == 128000
+    assert info["duration"] == pytest.approx(200 * 1152 / 44100, rel=0.01)
+
+
+def test_probe_mp3_skips_id3v2_tag(tmp_path):
+    tag = b"ID3\x04\x00\x00" + bytes([0, 0, 0, 100]) + bytes(100)
+    info = probe_mp3(write_mp3(tmp_path / "tagged.mp3", 200, prefix=tag))
+    assert info["duration"] == pytest.approx(200 * 1152 / 44100, rel=0.01)
+
+
+def test_probe_mp3_uses_xing_frame_count(tmp_path):
+    info = probe_mp3(write_mp3(tmp_path / "vbr.mp3", 10, xing_frames=500))
+    assert info["duration"] == pytest.approx(500 * 1152 / 44100)
+
+
+def test_probe_mp3_rejects_files_without_frames(tmp_path):
+    path = tmp_path / "junk.mp3"
+    path.write_bytes(b"not audio" * 100)
+    assert probe_mp3(str(path)) is None
+
+
+def test_probe_wav(tmp_path):
+    path = str(tmp_path / "tone.wav")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(bytes(2 * 4000))
+    info = probe_wav(path)
+    assert info["duration"] == pytest.approx(0.5)
+    assert (info["sample_rate"], info["channels"], info["bitrate"]) == (8000, 1, 8000 * 16)
+
+
+def test_duration_is_probed_once_and_persisted(tmp_path, monkeypatch):
+    song = write_mp3(tmp_path / "song.mp3", 200)
+    probes = []
+    real_probe = song_cache.probe_song
+    monkeypatch.setattr(song_cache, "probe_song", lambda path: probes.append(path) or real_probe(path))
+
+    cache_file = str(tmp_path / "cache.json")
+    duration = SongMetadataCache(cache_file).duration(song)
+    assert duration == pytest.approx(200 * 1152 / 44100, rel=0.01)
+    assert SongMetadataCache(cache_file).duration(song) == duration  # Read back from disk
+    assert len(probes) == 1
+
+    write_mp3(tmp_path / "song.mp3", 400)  # A changed file is probed again
+    assert SongMetadataCache(cache_file).duration(song) == pytest.approx(2 * duration, rel=0.01)
+    assert len(probes) == 2
+
+
+@pytest.fixture
+def no_mixer(monkeypatch):
+    """Headless with no audio device: the mixer is closed and cannot be opened."""
+    import pygame
+
+    def fail():
+        raise pygame.error("no audio device")
+
+    monkeypatch.setattr(pygame.mixer, "get_init", lambda: None)
+    monkeypatch.setattr(pygame.mixer, "init", fail)
+
+
+def test_undecodable_song_is_logged_not_raised(tmp_path, no_mixer, capsys):
+    path = tmp_path / "song.ogg"
+    path.write_bytes(b"not audio" * 100)
+    assert song_cache.probe_song(str(path)) is None
+    assert "Could not decode" in capsys.readouterr().out
+
+    cache = SongMetadataCache(str(tmp_path / "cache.json"))
+    assert cache.duration(str(path)) is None
+    assert not (tmp_path / "cache.json").exists()  # Unknown results are retried next run
+
+
+def test_stale_entry_is_used_when_probing_fails(tmp_path, no_mixer):
+    song = write_mp3(tmp_path / "song.mp3", 200)
+    cache_file = str(tmp_path / "cache.json")
+    duration = SongMetadataCache(cache_file).duration(song)
+
+    (tmp_path / "song.mp3").write_bytes(b"not audio" * 100)
+    assert SongMetadataCache(cache_file).duration(song) == duration
@@ -0,0 +1,75 @@
+import pytest
+
+from song_clock import SongClock
+
+
+class FakeAudio:
+    """A perf_counter and mixer position that the test moves by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.position = None
+
+    def timer(self):
+        return self.now
+
+    def source(self):
+        return self.position
+
+
+def make_clock(start=0.0):
+    audio = FakeAudio()
+    clock = SongClock(position_source=audio.source, timer=audio.timer)
+    clock.start(start)
+    return clock, audio
+
+
+def test_free_runs_until_the_mixer_reports():
+    clock, audio = make_clock()
+    audio.now = 0.5
+    assert clock.update() == pytest.approx(0.5)
+
+
+def test_small_drift_is_corrected_gradually():
+    clock, audio = make_clock()
+    audio.now, audio.position = 1.0, 1.05
+    assert clock.update() == pytest.approx(1.0 + 0.05 * clock.drift_gain)
+
+
+def test_forward_snap_is_immediate():
+    clock, audio = make_clock()
+    audio.now, audio.position = 1.0, 2.0
+    assert clock.update() == pytest.approx(2.0)
+    audio.now = 1.5
+    assert clock.update() == pytest.approx(2.5)
+
+
+def test_backward_snap_holds_instead_of_rewinding():
+    clock, audio = make_clock()
+    audio.now = 2.0
+    assert clock.update() == pytest.approx(2.0)
+    audio.now, audio.position = 2.1, 1.6  # The mixer is 0.5 s behind
+    times = [clock.update()]
+    for _ in range(10):
+        audio.now += 0.1
+        audio.position += 0.1
+        times.append(clock.update())
+    assert times == sorted(times)
+    assert times[1] == pytest.approx(2.0)  # Held
+    assert times[-1] == pytest.approx(audio.position)  # And back on the mixer
+
+
+def test_stop_stops_following_the_mixer():
+    clock, audio = make_clock()
+    clock.stop()
+    audio.now, audio.position = 1.0, 3.0
+    assert clock.update() == pytest.approx(1.0)
+
+
+def test_lead_in_ignores_the_mixer_until_zero():
+    clock, audio = make_clock(-1.0)
+    audio.position = 5.0  # Stale position from whatever played before
+    audio.now = 0.5
+    assert clock.update() == pytest.approx(-0.5)
+    audio.now, audio.position = 1.2, 0.2
+    assert clock.update() == pytest.approx(0.2)
@@ -0,0 +1,34 @@
+import pygame
+import pytest
+
+from text_cache import TextCache
+
+WHITE = (255, 255, 255)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fonts():
+    pygame.font.init()
+    yield
+    pygame.font.quit()
+
+
+def test_text_cache_reuses_and_evicts_least_recently_used():
+    font = pygame.font.Font(None, 20)
+    cache = TextCache(capacity=2)
+    a = cache.render(font, "a", True, WHITE)
+    cache.render(font, "b", True, WHITE)
+    assert cache.render(font, "a", True, WHITE) is a  # Refreshes "a"
+    cache.render(font, "c", True, WHITE)  # Evicts "b"
+    assert cache.render(font, "a", True, WHITE) is a
+    assert cache.stats() == {"hits": 2, "misses": 3, "surfaces": 2}
+    cache.render(font, "b", True, WHITE)
+    assert cache.misses == 4
+
+
+def test_text_cache_keys_on_colour_and_background():
+    font = pygame.font.Font(None, 20)
+    cache = TextCache()
+    plain = cache.render(font, "x", True, WHITE)
+    assert cache.render(font, "x", True, [255, 255, 255]) is plain  # Lists and tuples match
+    assert cache.render(font, "x", True, WHITE, (0, 0, 0)) is not plain
@@ -0,0 +1,41 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """Rendered text surfaces keyed by (font, text, colour, antialias, background).
+
+    HUD and menu labels rarely change between frames, so drawing them through
+    the cache turns most per-frame Font.render calls into a dictionary hit.
+    The least recently used entries are evicted once `capacity` is reached.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """Same arguments as Font.render; returns a shared surface, so don't draw on it."""
+        key = (font, text, tuple(color), antialias, background and tuple(background))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+
+        surface = font.render(text, antialias, color, background)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "surfaces": len(self._surfaces)}
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+TEXT_CACHE = TextCache()